@@ -0,0 +1,164 @@
+# admission.py
+import asyncio
+import math
+import re
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+
+import jwt
+from decouple import config
+from fastapi import HTTPException, Request
+from fastapi.responses import JSONResponse
+
+from auth import SECRET_KEY
+
+
+def client_key(request: Request) -> str:
+    """Identify the caller by token subject, falling back to the client address"""
+    authorization = request.headers.get("Authorization", "")
+    if authorization.lower().startswith("bearer "):
+        try:
+            payload = jwt.decode(authorization[7:], SECRET_KEY, algorithms=["HS256"])
+            if payload.get("sub"):
+                return f"user:{payload['sub']}"
+        except jwt.InvalidTokenError:
+            pass
+    return f"addr:{request.client.host if request.client else 'unknown'}"
+
+
+class LaneFull(Exception):
+    def __init__(self, detail: str, retry_after: int):
+        super().__init__(detail)
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class AdmissionLane:
+    """Concurrency limit with a bounded wait queue and a per-caller quota.
+
+    A request holds one slot for its lifetime. When all slots are busy it
+    waits in the queue; when the queue is full, the caller already has
+    per_user requests in this lane, or the wait exceeds max_wait seconds,
+    the request is rejected with 429 and a Retry-After estimate. Each lane
+    has its own slots, so a storm in one lane never consumes capacity
+    reserved for another.
+
+    Lanes guarding large request bodies must be enforced by
+    AdmissionMiddleware, which runs before the body is read; used as a
+    FastAPI dependency a lane only runs after the form has been parsed.
+    """
+
+    def __init__(self, name: str, max_concurrent: int, max_queue: int, per_user: int = None, max_wait: float = 30.0):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.per_user = per_user
+        self.max_wait = max_wait
+        self._slots = asyncio.Semaphore(max_concurrent)
+        # Counted synchronously on arrival, so a burst sees itself before any request awaits
+        self._active = 0
+        self._waiting = 0
+        self._per_user = defaultdict(int)
+        self._avg_hold = 1.0  # smoothed seconds a request holds a slot
+
+    def _retry_after(self) -> int:
+        return max(1, math.ceil(self._avg_hold * (self._waiting + 1) / self.max_concurrent))
+
+    def _reject(self, detail: str):
+        raise LaneFull(detail, self._retry_after())
+
+    @asynccontextmanager
+    async def admit(self, key: str):
+        """Hold a slot for the duration of the block, or raise LaneFull"""
+        if self.per_user is not None and self._per_user[key] >= self.per_user:
+            self._reject(f"Too many concurrent {self.name} requests for this user")
+        if self._active + self._waiting >= self.max_concurrent + self.max_queue:
+            self._reject(f"Server busy: {self.name} queue is full")
+
+        self._per_user[key] += 1
+        self._waiting += 1
+        try:
+            try:
+                await asyncio.wait_for(self._slots.acquire(), timeout=self.max_wait)
+            except asyncio.TimeoutError:
+                self._reject(f"Server busy: timed out waiting for a {self.name} slot")
+            finally:
+                self._waiting -= 1
+
+            self._active += 1
+            started = time.monotonic()
+            try:
+                yield
+            finally:
+                self._active -= 1
+                self._slots.release()
+                self._avg_hold = 0.8 * self._avg_hold + 0.2 * (time.monotonic() - started)
+        finally:
+            self._per_user[key] -= 1
+            if not self._per_user[key]:
+                del self._per_user[key]
+
+    async def __call__(self, request: Request):
+        try:
+            async with self.admit(client_key(request)):
+                yield
+        except LaneFull as e:
+            raise HTTPException(status_code=429, detail=e.detail, headers={"Retry-After": str(e.retry_after)})
+
+
+class AdmissionMiddleware:
+    """ASGI middleware applying lanes by method and path before the request body is read.
+
+    routes is a list of (method, path regex, lane); the first match wins.
+    """
+
+    def __init__(self, app, routes):
+        self.app = app
+        self.routes = [(method, re.compile(pattern), lane) for method, pattern, lane in routes]
+
+    def _lane(self, scope):
+        for method, pattern, lane in self.routes:
+            if scope["method"] == method and pattern.fullmatch(scope["path"]):
+                return lane
+        return None
+
+    async def __call__(self, scope, receive, send):
+        lane = self._lane(scope) if scope["type"] == "http" else None
+        if lane is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            async with lane.admit(client_key(Request(scope))):
+                await self.app(scope, receive, send)
+        except LaneFull as e:
+            response = JSONResponse(
+                status_code=429,
+                content={"detail": e.detail},
+                headers={"Retry-After": str(e.retry_after)}
+            )
+            await response(scope, receive, send)
+
+
+# Heavy lanes: large request bodies, disk and CPU bound work
+upload_lane = AdmissionLane(
+    "upload",
+    max_concurrent=config("UPLOAD_MAX_CONCURRENT", default=4, cast=int),
+    max_queue=config("UPLOAD_MAX_QUEUE", default=16, cast=int),
+    per_user=config("UPLOAD_PER_USER", default=2, cast=int),
+)
+report_lane = AdmissionLane(
+    "report",
+    max_concurrent=config("REPORT_MAX_CONCURRENT", default=2, cast=int),
+    max_queue=config("REPORT_MAX_QUEUE", default=8, cast=int),
+    per_user=config("REPORT_PER_USER", default=1, cast=int),
+)
+
+# Reserved lane for auth and dashboard reads, isolated from the heavy lanes
+interactive_lane = AdmissionLane(
+    "interactive",
+    max_concurrent=config("INTERACTIVE_MAX_CONCURRENT", default=64, cast=int),
+    max_queue=config("INTERACTIVE_MAX_QUEUE", default=256, cast=int),
+    max_wait=5.0,
+)
@@ -0,0 +1,40 @@
+"""add_video_metadata_columns
+
+Revision ID: 5c1d2e7a9b30
+Revises: b019f70fc1e5
+Create Date: 2026-10-19 15:02:11.184302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1d2e7a9b30'
+down_revision: Union[str, None] = 'b019f70fc1e5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('videos', sa.Column('duration_seconds', sa.Float(), nullable=True))
+    op.add_column('videos', sa.Column('fps', sa.Float(), nullable=True))
+    op.add_column('videos', sa.Column('frame_count', sa.Integer(), nullable=True))
+    op.add_column('videos', sa.Column('width', sa.Integer(), nullable=True))
+    op.add_column('videos', sa.Column('height', sa.Integer(), nullable=True))
+    op.add_column('videos', sa.Column('codec', sa.String(), nullable=True))
+    op.add_column('videos', sa.Column('probed_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('videos', 'probed_at')
+    op.drop_column('videos', 'codec')
+    op.drop_column('videos', 'height')
+    op.drop_column('videos', 'width')
+    op.drop_column('videos', 'frame_count')
+    op.drop_column('videos', 'fps')
+    op.drop_column('videos', 'duration_seconds')
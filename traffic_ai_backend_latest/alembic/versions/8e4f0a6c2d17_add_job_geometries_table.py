@@ -0,0 +1,41 @@
+"""add_job_geometries_table
+
+Revision ID: 8e4f0a6c2d17
+Revises: 5c1d2e7a9b30
+Create Date: 2026-10-19 15:20:43.502911
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e4f0a6c2d17'
+down_revision: Union[str, None] = '5c1d2e7a9b30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('job_geometries',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('job_id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('kind', sa.String(), nullable=False),
+        sa.Column('points', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()')),
+        sa.ForeignKeyConstraint(['job_id'], ['jobs.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_job_geometries_id', 'job_geometries', ['id'], unique=False)
+    op.create_index('ix_job_geometries_job_id', 'job_geometries', ['job_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_job_geometries_job_id', table_name='job_geometries')
+    op.drop_index('ix_job_geometries_id', table_name='job_geometries')
+    op.drop_table('job_geometries')
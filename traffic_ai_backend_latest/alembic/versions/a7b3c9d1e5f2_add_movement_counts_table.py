@@ -0,0 +1,41 @@
+"""add_movement_counts_table
+
+Revision ID: a7b3c9d1e5f2
+Revises: 8e4f0a6c2d17
+Create Date: 2026-10-19 15:41:08.377125
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7b3c9d1e5f2'
+down_revision: Union[str, None] = '8e4f0a6c2d17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('movement_counts',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('job_id', sa.Integer(), nullable=False),
+        sa.Column('bin_start', sa.DateTime(), nullable=False),
+        sa.Column('approach', sa.String(), nullable=False),
+        sa.Column('exit', sa.String(), nullable=False),
+        sa.Column('class_id', sa.Integer(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False, server_default=sa.text('0')),
+        sa.ForeignKeyConstraint(['job_id'], ['jobs.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('job_id', 'bin_start', 'approach', 'exit', 'class_id', name='uq_movement_counts_bin')
+    )
+    op.create_index('ix_movement_counts_id', 'movement_counts', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_movement_counts_id', table_name='movement_counts')
+    op.drop_table('movement_counts')
@@ -0,0 +1,38 @@
+"""add_video_id_to_movement_counts
+
+Revision ID: b4d6f8a0c2e1
+Revises: f1a3c5e7b9d2
+Create Date: 2026-10-19 19:02:41.530817
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4d6f8a0c2e1'
+down_revision: Union[str, None] = 'f1a3c5e7b9d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('movement_counts', sa.Column('video_id', sa.Integer(), nullable=False))
+    op.create_foreign_key('fk_movement_counts_video_id', 'movement_counts', 'videos', ['video_id'], ['id'])
+    op.drop_constraint('uq_movement_counts_bin', 'movement_counts', type_='unique')
+    op.create_unique_constraint(
+        'uq_movement_counts_bin', 'movement_counts', ['job_id', 'video_id', 'bin_start', 'approach', 'exit', 'class_id']
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_movement_counts_bin', 'movement_counts', type_='unique')
+    op.create_unique_constraint(
+        'uq_movement_counts_bin', 'movement_counts', ['job_id', 'bin_start', 'approach', 'exit', 'class_id']
+    )
+    op.drop_constraint('fk_movement_counts_video_id', 'movement_counts', type_='foreignkey')
+    op.drop_column('movement_counts', 'video_id')
@@ -0,0 +1,34 @@
+"""add_video_progress_columns
+
+Revision ID: c2d8e4f6a1b9
+Revises: a7b3c9d1e5f2
+Create Date: 2026-10-19 16:02:37.921460
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2d8e4f6a1b9'
+down_revision: Union[str, None] = 'a7b3c9d1e5f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('videos', sa.Column('frames_processed', sa.Integer(), server_default=sa.text('0'), nullable=True))
+    op.add_column('videos', sa.Column('frames_total', sa.Integer(), nullable=True))
+    op.add_column('videos', sa.Column('processing_fps', sa.Float(), nullable=True))
+    op.add_column('videos', sa.Column('progress_updated_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('videos', 'progress_updated_at')
+    op.drop_column('videos', 'processing_fps')
+    op.drop_column('videos', 'frames_total')
+    op.drop_column('videos', 'frames_processed')
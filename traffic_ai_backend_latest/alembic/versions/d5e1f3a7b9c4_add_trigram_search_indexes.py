@@ -0,0 +1,44 @@
+"""add_trigram_search_indexes
+
+Revision ID: d5e1f3a7b9c4
+Revises: c2d8e4f6a1b9
+Create Date: 2026-10-19 16:44:19.630582
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5e1f3a7b9c4'
+down_revision: Union[str, None] = 'c2d8e4f6a1b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index('ix_videos_filename_trgm', 'videos', ['filename'], postgresql_using='gin',
+                    postgresql_ops={'filename': 'gin_trgm_ops'})
+    op.create_index('ix_jobs_name_trgm', 'jobs', ['name'], postgresql_using='gin',
+                    postgresql_ops={'name': 'gin_trgm_ops'})
+    op.create_index('ix_jobs_job_number_trgm', 'jobs', ['job_number'], postgresql_using='gin',
+                    postgresql_ops={'job_number': 'gin_trgm_ops'})
+    op.create_index('ix_jobs_additional_notes_trgm', 'jobs', ['additional_notes'], postgresql_using='gin',
+                    postgresql_ops={'additional_notes': 'gin_trgm_ops'})
+    # Search is always scoped to the caller
+    op.create_index('ix_videos_user_id', 'videos', ['user_id'], unique=False)
+    op.create_index('ix_jobs_user_id', 'jobs', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_jobs_user_id', table_name='jobs')
+    op.drop_index('ix_videos_user_id', table_name='videos')
+    op.drop_index('ix_jobs_additional_notes_trgm', table_name='jobs')
+    op.drop_index('ix_jobs_job_number_trgm', table_name='jobs')
+    op.drop_index('ix_jobs_name_trgm', table_name='jobs')
+    op.drop_index('ix_videos_filename_trgm', table_name='videos')
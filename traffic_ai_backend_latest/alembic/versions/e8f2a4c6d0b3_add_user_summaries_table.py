@@ -0,0 +1,44 @@
+"""add_user_summaries_table
+
+Revision ID: e8f2a4c6d0b3
+Revises: d5e1f3a7b9c4
+Create Date: 2026-10-19 17:12:50.284716
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8f2a4c6d0b3'
+down_revision: Union[str, None] = 'd5e1f3a7b9c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('user_summaries',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('jobs_pending', sa.Integer(), nullable=False, server_default=sa.text('0')),
+        sa.Column('jobs_analyzing', sa.Integer(), nullable=False, server_default=sa.text('0')),
+        sa.Column('jobs_complete', sa.Integer(), nullable=False, server_default=sa.text('0')),
+        sa.Column('videos_total', sa.Integer(), nullable=False, server_default=sa.text('0')),
+        sa.Column('videos_pending', sa.Integer(), nullable=False, server_default=sa.text('0')),
+        sa.Column('reports_total', sa.Integer(), nullable=False, server_default=sa.text('0')),
+        sa.Column('reports_week_start', sa.DateTime(), nullable=True),
+        sa.Column('reports_this_week', sa.Integer(), nullable=False, server_default=sa.text('0')),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()')),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('user_id')
+    )
+    # Recent-jobs list on the summary
+    op.create_index('ix_jobs_user_id_created_at', 'jobs', ['user_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_jobs_user_id_created_at', table_name='jobs')
+    op.drop_table('user_summaries')
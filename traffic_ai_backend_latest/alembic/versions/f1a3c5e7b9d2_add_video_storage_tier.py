@@ -0,0 +1,32 @@
+"""add_video_storage_tier
+
+Revision ID: f1a3c5e7b9d2
+Revises: e8f2a4c6d0b3
+Create Date: 2026-10-19 17:48:26.715093
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1a3c5e7b9d2'
+down_revision: Union[str, None] = 'e8f2a4c6d0b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('videos', sa.Column('storage_tier', sa.String(), server_default='hot', nullable=True))
+    op.add_column('videos', sa.Column('last_accessed_at', sa.DateTime(), nullable=True))
+    op.create_index('ix_videos_storage_tier_last_accessed_at', 'videos', ['storage_tier', 'last_accessed_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_videos_storage_tier_last_accessed_at', table_name='videos')
+    op.drop_column('videos', 'last_accessed_at')
+    op.drop_column('videos', 'storage_tier')
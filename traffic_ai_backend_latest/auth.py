@@ -13,8 +13,6 @@ from passlib.context import CryptContext
 import jwt
 from jwt import ExpiredSignatureError, InvalidTokenError
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
@@ -43,7 +41,7 @@ def verify_password(plain_password: str, hashed_password: str):
 
 def create_jwt_token(data: dict, expires_delta: int = 60):
     """Generate JWT token with expiration"""
-    logger.info(f"Generating JWT token for user: {data.get('sub')}")
+    logger.debug("Generating JWT token for user: %s", data.get("sub"))
     
     expire = datetime.datetime.utcnow() + datetime.timedelta(minutes=expires_delta)
     to_encode = data.copy()
@@ -53,7 +51,7 @@ def create_jwt_token(data: dict, expires_delta: int = 60):
         token = jwt.encode(to_encode, SECRET_KEY, algorithm="HS256")
         return token
     except Exception as e:
-        logger.error(f"Failed to generate JWT: {str(e)}")
+        logger.error("Failed to generate JWT: %s", str(e))
         raise HTTPException(status_code=500, detail="Token generation failed")
 
 async def get_current_user(token: str = Depends(oauth2_scheme)):
@@ -83,34 +81,34 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
 # Route to register a new user
 @router.post("/register")
 async def register_user(request: RegisterRequest):
-    logger.info(f"Received registration request for email: {request.email}")
+    logger.info("Received registration request", extra={"email": request.email})
 
     query = users.select().where(users.c.email == request.email)
     existing_user = await database.fetch_one(query)
     if existing_user:
-        logger.warning(f"Email already registered: {request.email}")
+        logger.warning("Email already registered", extra={"email": request.email})
         raise HTTPException(status_code=400, detail="Email already registered")
 
     hashed_password = hash_password(request.password)
     query = insert(users).values(name=request.name, email=request.email, password=hashed_password)
     await database.execute(query)
     
-    logger.info(f"User {request.email} registered successfully")
+    logger.info("User registered", extra={"email": request.email})
     return {"message": "User registered successfully"}
 
 # Route to login and receive JWT
 @router.post("/login")
 async def login_user(form_data: LoginRequest):
-    logger.info(f"Login attempt for email: {form_data.email}")
+    logger.debug("Login attempt", extra={"email": form_data.email})
 
     query = select(users).where(users.c.email == form_data.email)
     user = await database.fetch_one(query)
 
     if not user or not verify_password(form_data.password, user["password"]):
-        logger.warning(f"Invalid login attempt for email: {form_data.email}")
+        logger.warning("Invalid login attempt", extra={"email": form_data.email})
         raise HTTPException(status_code=400, detail="Invalid credentials")
 
     token = create_jwt_token({"sub": user["email"]})
-    logger.info(f"Token issued for {form_data.email}")
+    logger.info("Token issued", extra={"email": form_data.email})
 
     return {"access_token": token, "token_type": "bearer"}
@@ -0,0 +1,189 @@
+# benchmark.py
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+
+import numpy as np
+
+from counting import movement_events
+from synthetic import generate_scene, write_video
+from tracking import track_detections
+
+
+def _stage_rss(fn):
+    """Run fn in a forked child and return its (peak RSS, growth over the RSS it started with) in MB.
+
+    tracemalloc only sees Python allocations; RSS also covers native buffers
+    such as OpenCV's decode and encode frames. Without fork (Windows) this
+    returns (None, None).
+    """
+    import resource
+
+    if "fork" not in multiprocessing.get_all_start_methods():
+        return None, None
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    scale = 1 if sys.platform == "darwin" else 1024
+
+    context = multiprocessing.get_context("fork")
+    receiver, sender = context.Pipe(duplex=False)
+
+    def child():
+        before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        fn()
+        sender.send((before, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss))
+
+    process = context.Process(target=child)
+    process.start()
+    # Drop the parent's copy of the write end so recv() sees EOF if the child dies without sending
+    sender.close()
+    try:
+        before, peak = receiver.recv()
+    except EOFError:
+        before = peak = None
+    finally:
+        process.join()
+        receiver.close()
+    if peak is None or process.exitcode != 0:
+        raise RuntimeError(f"Stage failed in the memory measurement child (exit code {process.exitcode})")
+    return round(peak * scale / 2 ** 20, 1), round((peak - before) * scale / 2 ** 20, 1)
+
+
+def _run_stage(name, fn, frames):
+    """Time a stage, then run it again for its memory high-water marks.
+
+    The memory runs are separate because tracing slows allocation-heavy NumPy
+    code several times over and would distort the throughput figure.
+    """
+    started = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    peak_rss, rss_growth = _stage_rss(fn)
+    return result, {
+        "stage": name,
+        "seconds": round(elapsed, 3),
+        "frames_per_second": round(frames / elapsed, 1) if elapsed > 0 else None,
+        "peak_python_memory_mb": round(peak / 2 ** 20, 2),
+        "peak_rss_mb": peak_rss,
+        "rss_growth_mb": rss_growth,
+    }
+
+
+def count_accuracy(predicted, expected):
+    """1 - (sum of absolute per-movement errors / true total), per (approach, exit, class)"""
+    predicted = Counter(map(tuple, np.asarray(predicted).tolist()))
+    expected = Counter(map(tuple, np.asarray(expected).tolist()))
+    total = sum(expected.values())
+    if not total:
+        return None
+    error = sum(abs(predicted[key] - expected[key]) for key in set(predicted) | set(expected))
+    return round(max(0.0, 1 - error / total), 4)
+
+
+def _decode_all(path):
+    import cv2
+
+    capture = cv2.VideoCapture(path)
+    decoded = 0
+    try:
+        while True:
+            ok, _ = capture.read()
+            if not ok:
+                break
+            decoded += 1
+    finally:
+        capture.release()
+    return decoded
+
+
+def run_benchmark(with_video: bool = True, **scene_options):
+    """Push a synthetic scene through ingest, frame extraction, tracking and counting"""
+    scene = generate_scene(**scene_options)
+    stages = []
+
+    if with_video:
+        from video_probe import probe_video_file
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "synthetic.mp4")
+            write_video(scene, path)
+
+            metadata, stats = _run_stage("ingest", lambda: probe_video_file(path), scene.frame_count)
+            stats["accuracy"] = 1.0 if metadata["frame_count"] == scene.frame_count else round(
+                min(metadata["frame_count"] or 0, scene.frame_count) / scene.frame_count, 4)
+            stages.append(stats)
+
+            decoded, stats = _run_stage("frame_extraction", lambda: _decode_all(path), scene.frame_count)
+            stats["accuracy"] = round(decoded / scene.frame_count, 4)
+            stages.append(stats)
+
+    tracks, stats = _run_stage(
+        "tracking", lambda: track_detections(scene.det_frames, scene.detections), scene.frame_count
+    )
+    stats["tracks"] = int(len(np.unique(tracks[1])))
+    stats["vehicles"] = int(len(scene.movements))
+    stages.append(stats)
+
+    events, stats = _run_stage(
+        "counting", lambda: movement_events(*tracks, lines=scene.lines), scene.frame_count
+    )
+    predicted = np.column_stack([events["approach"], events["exit"], events["class_id"]])
+    stats["counted"] = int(len(predicted))
+    stats["accuracy"] = count_accuracy(predicted, scene.movements)
+    stages.append(stats)
+
+    # Counting on perfect tracks isolates counting errors from tracking errors
+    gt_centers = (scene.gt_boxes[:, :2] + scene.gt_boxes[:, 2:]) / 2
+    gt_events = movement_events(scene.gt_frames, scene.gt_track_ids, gt_centers, scene.gt_classes, lines=scene.lines)
+    stats["accuracy_on_ground_truth_tracks"] = count_accuracy(
+        np.column_stack([gt_events["approach"], gt_events["exit"], gt_events["class_id"]]), scene.movements
+    )
+
+    return {
+        "scene": {
+            "frames": scene.frame_count,
+            "fps": scene.fps,
+            "resolution": f"{scene.width}x{scene.height}",
+            "vehicles": int(len(scene.movements)),
+            "detections": int(len(scene.detections)),
+        },
+        "stages": stages,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the analysis pipeline on synthetic footage")
+    parser.add_argument("--duration", type=float, default=60, help="seconds of video")
+    parser.add_argument("--fps", type=float, default=25)
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--density", type=float, default=120, help="vehicles per minute")
+    parser.add_argument("--speed", type=float, default=0.006, help="frame heights per frame")
+    parser.add_argument("--occlusion", type=float, default=0.05, help="chance a detection is missing")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-video", action="store_true", help="skip the ingest and frame extraction stages")
+    args = parser.parse_args()
+
+    report = run_benchmark(
+        with_video=not args.no_video,
+        duration_seconds=args.duration,
+        fps=args.fps,
+        width=args.width,
+        height=args.height,
+        vehicles_per_minute=args.density,
+        speed=args.speed,
+        occlusion=args.occlusion,
+        seed=args.seed,
+    )
+    print(json.dumps(report, indent=2))
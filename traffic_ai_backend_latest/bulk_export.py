@@ -0,0 +1,150 @@
+# bulk_export.py
+import csv
+import io
+import json
+import logging
+import os
+import re
+import zipfile
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import select, and_, or_
+
+from auth import get_current_user, oauth2_scheme
+from database import database
+from models import jobs, videos, job_videos, reports
+from job_management import REPORTS_DIR
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+CHUNK_SIZE = 1024 * 1024
+
+MANIFEST_COLUMNS = [
+    "job_id", "job_number", "name", "status", "survey_types", "created_at", "completed_at",
+    "video_id", "filename", "duration_seconds", "uploaded_at",
+]
+
+
+class ExportRequest(BaseModel):
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+    survey_types: Optional[List[str]] = None
+    job_ids: Optional[List[int]] = None
+
+
+def _folder_name(job_number) -> str:
+    """Job number as a single archive folder: no separators or dot segments, so entries cannot escape the ZIP root"""
+    parts = [part for part in re.split(r"[\\/]+", str(job_number)) if part not in ("", ".", "..")]
+    return "_".join(parts) or "job"
+
+
+def _escape_like(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class _ZipSink(io.RawIOBase):
+    """Unseekable write target that hands finished bytes back to the generator"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def stream_zip(report_rows, manifest_rows):
+    """Yield a ZIP archive chunk by chunk from async row iterators; memory use is bounded by CHUNK_SIZE"""
+    sink = _ZipSink()
+    # With an unseekable target zipfile writes sizes in data descriptors, so nothing is buffered per entry
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+        abs_reports_dir = os.path.abspath(REPORTS_DIR)
+        async for report in report_rows:
+            abs_file_path = os.path.abspath(report["file_path"])
+            if not abs_file_path.startswith(abs_reports_dir) or not os.path.exists(abs_file_path):
+                logger.warning("Skipping missing report %s at %s", report["id"], abs_file_path)
+                continue
+
+            arcname = f"{_folder_name(report['job_number'])}/{os.path.basename(abs_file_path)}"
+            with open(abs_file_path, "rb") as source, archive.open(arcname, "w", force_zip64=True) as target:
+                while True:
+                    chunk = await run_in_threadpool(source.read, CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    await run_in_threadpool(target.write, chunk)
+                    yield sink.drain()
+            yield sink.drain()
+
+        with archive.open("manifest.csv", "w", force_zip64=True) as target:
+            text = io.TextIOWrapper(target, encoding="utf-8", newline="")
+            writer = csv.DictWriter(text, fieldnames=MANIFEST_COLUMNS)
+            writer.writeheader()
+            async for row in manifest_rows:
+                writer.writerow({**dict(row), "status": getattr(row["status"], "value", row["status"])})
+                text.flush()
+                yield sink.drain()
+            text.flush()
+            text.detach()
+    yield sink.drain()
+
+
+@router.post("/export/")
+async def export_jobs(data: ExportRequest, token: str = Depends(oauth2_scheme)):
+    """Stream a ZIP of matching jobs' reports plus a CSV manifest of jobs and videos"""
+    user = await get_current_user(token)
+
+    conditions = [jobs.c.user_id == user["id"]]
+    if data.start_date:
+        conditions.append(jobs.c.created_at >= data.start_date)
+    if data.end_date:
+        conditions.append(jobs.c.created_at <= data.end_date)
+    if data.job_ids:
+        conditions.append(jobs.c.id.in_(data.job_ids))
+    if data.survey_types:
+        # survey_types is stored as a JSON list string
+        conditions.append(or_(*[
+            jobs.c.survey_types.like(f'%{_escape_like(json.dumps(t))}%', escape="\\") for t in data.survey_types
+        ]))
+    job_filter = and_(*conditions)
+
+    report_query = (
+        select(reports.c.id, reports.c.file_path, jobs.c.job_number)
+        .select_from(reports.join(jobs, reports.c.job_id == jobs.c.id))
+        .where(job_filter)
+        .order_by(jobs.c.id, reports.c.id)
+    )
+    manifest_query = (
+        select(
+            jobs.c.id.label("job_id"), jobs.c.job_number, jobs.c.name, jobs.c.status,
+            jobs.c.survey_types, jobs.c.created_at, jobs.c.completed_at,
+            videos.c.id.label("video_id"), videos.c.filename, videos.c.duration_seconds, videos.c.uploaded_at,
+        )
+        .select_from(
+            jobs.outerjoin(job_videos, job_videos.c.job_id == jobs.c.id).outerjoin(videos, videos.c.id == job_videos.c.video_id)
+        )
+        .where(job_filter)
+        .order_by(jobs.c.id, videos.c.id)
+    )
+
+    # Rows are streamed from the database while the archive is written, never loaded all at once
+    filename = f"export_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.zip"
+    return StreamingResponse(
+        stream_zip(database.iterate(report_query), database.iterate(manifest_query)),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
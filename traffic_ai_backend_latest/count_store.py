@@ -0,0 +1,109 @@
+# count_store.py
+from datetime import datetime, timedelta
+
+import numpy as np
+from sqlalchemy import select, delete, and_, func, cast, Integer
+from sqlalchemy.dialects.postgresql import insert
+
+from database import database
+from models import movement_counts
+
+# Granularity counts are stored at; reports roll these up to coarser intervals
+BIN_MINUTES = 15
+
+
+def bin_events(events: dict, gate_names: list, fps: float, start_time: datetime, bin_minutes: int = BIN_MINUTES) -> list:
+    """Aggregate movement events into per-bin counts aligned to the clock.
+
+    events is the dict returned by counting.movement_events; start_time is the
+    wall-clock time of frame 0 of the video the events came from.
+    """
+    if not len(events["track_id"]):
+        return []
+
+    bin_seconds = bin_minutes * 60
+    midnight = start_time.replace(hour=0, minute=0, second=0, microsecond=0)
+    offset = (start_time - midnight).total_seconds()
+    bins = np.floor((offset + events["end_frame"] / fps) / bin_seconds).astype(np.int64)
+
+    keys = np.column_stack([bins, events["approach"], events["exit"], events["class_id"]])
+    unique_keys, counts = np.unique(keys, axis=0, return_counts=True)
+
+    return [
+        {
+            "bin_start": midnight + timedelta(seconds=int(b) * bin_seconds),
+            "approach": gate_names[a],
+            "exit": gate_names[e],
+            "class_id": int(c),
+            "count": int(n),
+        }
+        for (b, a, e, c), n in zip(unique_keys.tolist(), counts.tolist())
+    ]
+
+
+async def record_events(
+    job_id: int,
+    video_id: int,
+    events: dict,
+    gate_names: list,
+    fps: float,
+    start_time: datetime,
+    replace: bool = True,
+):
+    """Store one video's movement events as binned counts for a job.
+
+    By default the video's existing bins for the job are replaced, so
+    re-counting (new lines, a resumed video) never double-counts; pass
+    replace=False to add a further batch of events from the same video.
+    """
+    if video_id is None:
+        # NULLs never conflict in the unique constraint, so bins without a video would duplicate
+        raise ValueError("record_events needs the source video_id")
+    rows = bin_events(events, gate_names, fps, start_time)
+
+    async with database.transaction():
+        if replace:
+            await database.execute(
+                delete(movement_counts).where(
+                    and_(movement_counts.c.job_id == job_id, movement_counts.c.video_id == video_id)
+                )
+            )
+        if not rows:
+            return 0
+
+        query = insert(movement_counts).values([{"job_id": job_id, "video_id": video_id, **row} for row in rows])
+        query = query.on_conflict_do_update(
+            constraint="uq_movement_counts_bin",
+            set_={"count": movement_counts.c.count + query.excluded["count"]}
+        )
+        await database.execute(query)
+    return len(rows)
+
+
+async def get_binned_counts(job_id: int, interval_minutes: int = BIN_MINUTES):
+    """Counts per movement and class rolled up to interval_minutes (a multiple of BIN_MINUTES)"""
+    if interval_minutes <= 0 or interval_minutes % BIN_MINUTES:
+        raise ValueError(f"Interval must be a positive multiple of {BIN_MINUTES} minutes")
+
+    bin_start = movement_counts.c.bin_start
+    if interval_minutes == BIN_MINUTES:
+        bucket = bin_start
+    else:
+        # Truncate each stored bin to the start of its clock-aligned interval
+        seconds_into_interval = cast(func.extract("epoch", bin_start), Integer) % (interval_minutes * 60)
+        bucket = bin_start - func.make_interval(0, 0, 0, 0, 0, 0, seconds_into_interval)
+    bucket = bucket.label("bin_start")
+
+    query = (
+        select(
+            bucket,
+            movement_counts.c.approach,
+            movement_counts.c.exit,
+            movement_counts.c.class_id,
+            func.sum(movement_counts.c.count).label("count"),
+        )
+        .where(movement_counts.c.job_id == job_id)
+        .group_by(bucket, movement_counts.c.approach, movement_counts.c.exit, movement_counts.c.class_id)
+        .order_by(bucket, movement_counts.c.approach, movement_counts.c.exit, movement_counts.c.class_id)
+    )
+    return await database.fetch_all(query)
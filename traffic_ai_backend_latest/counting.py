@@ -0,0 +1,130 @@
+# counting.py
+import numpy as np
+
+
+def _cross(o, a, b):
+    """z component of (a - o) x (b - o), broadcast over leading axes"""
+    return (a[..., 0] - o[..., 0]) * (b[..., 1] - o[..., 1]) - (a[..., 1] - o[..., 1]) * (b[..., 0] - o[..., 0])
+
+
+def segment_crossings(starts, ends, lines):
+    """Which track steps cross which counting lines.
+
+    starts/ends are (S, 2) step endpoints, lines is (L, 2, 2). Returns an
+    (S, L) boolean matrix computed with a single broadcast orientation test.
+    """
+    p = starts[:, None, :]
+    q = ends[:, None, :]
+    a = lines[None, :, 0, :]
+    b = lines[None, :, 1, :]
+
+    d1 = _cross(a, b, p)
+    d2 = _cross(a, b, q)
+    d3 = _cross(p, q, a)
+    d4 = _cross(p, q, b)
+    # Points exactly on the line count as the non-positive side, so touching
+    # the line and then leaving it again is only one crossing
+    return ((d1 > 0) != (d2 > 0)) & ((d3 > 0) != (d4 > 0))
+
+
+def points_in_polygon(points, polygon):
+    """Even-odd rule test of (P, 2) points against one (V, 2) polygon, vectorized over points and edges"""
+    x = points[:, 0:1]
+    y = points[:, 1:2]
+    v0 = polygon
+    v1 = np.roll(polygon, -1, axis=0)
+
+    straddles = (v0[None, :, 1] > y) != (v1[None, :, 1] > y)
+    dy = v1[None, :, 1] - v0[None, :, 1]
+    safe_dy = np.where(dy == 0, 1, dy)
+    x_at_y = v0[None, :, 0] + (y - v0[None, :, 1]) * (v1[None, :, 0] - v0[None, :, 0]) / safe_dy
+    return (straddles & (x < x_at_y)).sum(axis=1) % 2 == 1
+
+
+def movement_events(frames, track_ids, centers, classes, lines=None, zones=None):
+    """Turn tracked centre points into approach -> exit movement events.
+
+    frames/track_ids/centers/classes are the columns returned by
+    tracking.track_detections. lines is an (L, 2, 2) array and zones a list of
+    (V, 2) polygons; gates are numbered lines first, then zones. A track's
+    approach is the first gate it touches and its exit the last one. Tracks
+    that touch a single zone, or a single line only once, produce no event.
+
+    Returns a dict of equal-length arrays: track_id, class_id, approach, exit,
+    start_frame, end_frame.
+    """
+    frames = np.asarray(frames, dtype=np.int64)
+    track_ids = np.asarray(track_ids, dtype=np.int64)
+    centers = np.asarray(centers, dtype=np.float64).reshape(-1, 2)
+    classes = np.asarray(classes, dtype=np.int64)
+    lines = np.empty((0, 2, 2)) if lines is None else np.asarray(lines, dtype=np.float64).reshape(-1, 2, 2)
+    zones = zones or []
+
+    order = np.lexsort((frames, track_ids))
+    frames, track_ids, centers, classes = frames[order], track_ids[order], centers[order], classes[order]
+
+    hit_track = []
+    hit_frame = []
+    hit_gate = []
+
+    # Line crossings, tested on every step between consecutive points of the same track
+    if len(lines) and len(frames) > 1:
+        same_track = track_ids[1:] == track_ids[:-1]
+        step_end = np.nonzero(same_track)[0] + 1
+        crossed = segment_crossings(centers[step_end - 1], centers[step_end], lines)
+        step, gate = np.nonzero(crossed)
+        hit_track.append(track_ids[step_end[step]])
+        hit_frame.append(frames[step_end[step]])
+        hit_gate.append(gate)
+
+    # Zone visits, offset so zone gates follow the line gates
+    for z, polygon in enumerate(zones):
+        inside = np.nonzero(points_in_polygon(centers, np.asarray(polygon, dtype=np.float64)))[0]
+        hit_track.append(track_ids[inside])
+        hit_frame.append(frames[inside])
+        hit_gate.append(np.full(len(inside), len(lines) + z))
+
+    empty = {
+        "track_id": np.empty(0, dtype=np.int64),
+        "class_id": np.empty(0, dtype=np.int64),
+        "approach": np.empty(0, dtype=np.int64),
+        "exit": np.empty(0, dtype=np.int64),
+        "start_frame": np.empty(0, dtype=np.int64),
+        "end_frame": np.empty(0, dtype=np.int64),
+    }
+    if not hit_track:
+        return empty
+
+    hit_track = np.concatenate(hit_track)
+    hit_frame = np.concatenate(hit_frame)
+    hit_gate = np.concatenate(hit_gate).astype(np.int64)
+    if not len(hit_track):
+        return empty
+
+    hit_order = np.lexsort((hit_gate, hit_frame, hit_track))
+    hit_track, hit_frame, hit_gate = hit_track[hit_order], hit_frame[hit_order], hit_gate[hit_order]
+
+    unique_tracks, first, counts = np.unique(hit_track, return_index=True, return_counts=True)
+    last = first + counts - 1
+    approach = hit_gate[first]
+    exit_gate = hit_gate[last]
+
+    # Same gate at both ends is only a movement for a line crossed more than once (a U-turn)
+    line_hits = np.bincount(
+        np.searchsorted(unique_tracks, hit_track[hit_gate < len(lines)]),
+        minlength=len(unique_tracks),
+    )
+    keep = (approach != exit_gate) | ((approach < len(lines)) & (line_hits >= 2))
+
+    # Class of each track taken from its first tracked point
+    _, first_point = np.unique(track_ids, return_index=True)
+    track_class = classes[first_point[np.searchsorted(track_ids[first_point], unique_tracks)]]
+
+    return {
+        "track_id": unique_tracks[keep],
+        "class_id": track_class[keep],
+        "approach": approach[keep],
+        "exit": exit_gate[keep],
+        "start_frame": hit_frame[first][keep],
+        "end_frame": hit_frame[last][keep],
+    }
@@ -0,0 +1,146 @@
+# detection_archive.py
+import os
+
+import numpy as np
+
+# One fixed-width little-endian record per detection (32 bytes)
+RECORD_DTYPE = np.dtype([
+    ("frame", "<i4"),
+    ("track_id", "<i4"),
+    ("x1", "<f4"),
+    ("y1", "<f4"),
+    ("x2", "<f4"),
+    ("y2", "<f4"),
+    ("score", "<f4"),
+    ("class_id", "<i4"),
+])
+
+# The sparse index stores the first row of every INDEX_STRIDE-th frame;
+# element 0 of the index file records the stride it was built with
+INDEX_STRIDE = 256
+
+
+def archive_paths(video_path: str):
+    """Data and index file locations, kept next to the upload.
+
+    For stored videos pass storage_tiering.hot_path(video), which stays
+    valid while the video is in cold storage.
+    """
+    return f"{video_path}.detections.bin", f"{video_path}.detections.idx.npy"
+
+
+def to_records(frames, detections, track_ids=None):
+    """Pack analyze_video-style (frames, (N, 6) detections) into archive records"""
+    detections = np.asarray(detections, dtype=np.float32).reshape(-1, 6)
+    records = np.empty(len(detections), dtype=RECORD_DTYPE)
+    records["frame"] = frames
+    records["track_id"] = -1 if track_ids is None else track_ids
+    for i, name in enumerate(("x1", "y1", "x2", "y2", "score")):
+        records[name] = detections[:, i]
+    records["class_id"] = detections[:, 5]
+    return records
+
+
+class DetectionArchiveWriter:
+    """Append frame-ordered detections to an archive, building the index as it goes.
+
+    Chunks must arrive in non-decreasing frame order. Nothing is visible to
+    readers until close(), which moves the finished files into place.
+    """
+
+    def __init__(self, video_path: str, stride: int = INDEX_STRIDE):
+        self.data_path, self.index_path = archive_paths(video_path)
+        self.stride = stride
+        self._tmp_data = f"{self.data_path}.tmp"
+        self._file = open(self._tmp_data, "wb")
+        self._rows = 0
+        self._last_frame = -1
+        self._index = []  # row offset of frame k * stride, for k = 0, 1, ...
+
+    def append(self, records):
+        records = np.asarray(records, dtype=RECORD_DTYPE)
+        if not len(records):
+            return
+        frames = records["frame"]
+        if frames[0] < self._last_frame or np.any(np.diff(frames) < 0):
+            raise ValueError("Detections must be appended in frame order")
+
+        # Fill in every block boundary up to this chunk's last frame
+        next_block = len(self._index)
+        last_block = int(frames[-1]) // self.stride
+        if last_block >= next_block:
+            boundaries = np.arange(next_block, last_block + 1) * self.stride
+            self._index.extend((self._rows + np.searchsorted(frames, boundaries, side="left")).tolist())
+
+        records.tofile(self._file)
+        self._rows += len(records)
+        self._last_frame = int(frames[-1])
+
+    def close(self):
+        self._file.close()
+        # Terminal entry so every lookup has an upper bound
+        self._index.append(self._rows)
+        np.save(f"{self.index_path}.tmp.npy", np.asarray([self.stride] + self._index, dtype=np.int64))
+        os.replace(f"{self.index_path}.tmp.npy", self.index_path)
+        os.replace(self._tmp_data, self.data_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._file.close()
+            os.remove(self._tmp_data)
+
+
+def write_archive(video_path: str, frames, detections, track_ids=None):
+    """Write a complete archive in one go"""
+    with DetectionArchiveWriter(video_path) as writer:
+        writer.append(to_records(frames, detections, track_ids))
+
+
+class DetectionArchive:
+    """Read-only, memory-mapped view of a video's detection archive"""
+
+    def __init__(self, video_path: str):
+        data_path, index_path = archive_paths(video_path)
+        index = np.load(index_path)
+        self.stride = int(index[0])
+        self.index = index[1:]
+        if os.path.getsize(data_path):
+            self.records = np.memmap(data_path, dtype=RECORD_DTYPE, mode="r")
+        else:
+            self.records = np.empty(0, dtype=RECORD_DTYPE)
+
+    def __len__(self):
+        return len(self.records)
+
+    def frame_range(self, start_frame: int, end_frame: int):
+        """Records with start_frame <= frame < end_frame, as a view into the mapped file.
+
+        The sparse index narrows the search to the blocks covering the range,
+        so only those pages of the file are read.
+        """
+        last_block = len(self.index) - 1
+        lo_block = min(max(start_frame, 0) // self.stride, last_block)
+        hi_block = min(-(-max(end_frame, 0) // self.stride), last_block)
+        lo, hi = int(self.index[lo_block]), int(self.index[hi_block])
+
+        window = self.records["frame"][lo:hi]
+        begin = lo + int(np.searchsorted(window, start_frame, side="left"))
+        end = lo + int(np.searchsorted(window, end_frame, side="left"))
+        return self.records[begin:end]
+
+    def time_range(self, start_seconds: float, end_seconds: float, fps: float):
+        """Records between two video timestamps"""
+        return self.frame_range(int(np.floor(start_seconds * fps)), int(np.ceil(end_seconds * fps)))
+
+    def iter_chunks(self, frames_per_chunk: int = INDEX_STRIDE * 16):
+        """Walk the whole archive in frame-aligned views, e.g. to re-run counting"""
+        if not len(self.records):
+            return
+        last_frame = int(self.records["frame"][-1])
+        for start in range(0, last_frame + 1, frames_per_chunk):
+            yield self.frame_range(start, start + frames_per_chunk)
@@ -2,7 +2,7 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from sqlalchemy.sql import select, update
-from database import database
+from database import database, read_database
 from models import example_videos
 from typing import List
 import datetime
@@ -23,7 +23,7 @@ class ExampleVideo(BaseModel):
 async def get_example_videos():
     """Get all active example videos"""
     query = select(example_videos).where(example_videos.c.is_active == True)
-    videos = await database.fetch_all(query)
+    videos = await read_database.fetch_all(query)
     return videos
 
 @router.post("/{video_id}/view/")
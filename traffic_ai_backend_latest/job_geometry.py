@@ -0,0 +1,121 @@
+# job_geometry.py
+import json
+from datetime import datetime
+from typing import List, Literal, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel, model_validator
+from sqlalchemy import select, insert, delete, and_
+
+from auth import get_current_user, oauth2_scheme
+from database import database
+from models import jobs, job_geometries
+
+router = APIRouter()
+
+
+class GeometryCreateRequest(BaseModel):
+    name: str
+    kind: Literal["line", "zone"]
+    points: List[Tuple[float, float]]
+
+    @model_validator(mode="after")
+    def check_point_count(self):
+        if self.kind == "line" and len(self.points) != 2:
+            raise ValueError("A counting line needs exactly 2 points")
+        if self.kind == "zone" and len(self.points) < 3:
+            raise ValueError("A zone needs at least 3 points")
+        return self
+
+
+def _geometry_response(row):
+    return {
+        "id": row["id"],
+        "name": row["name"],
+        "kind": row["kind"],
+        "points": json.loads(row["points"]),
+        "created_at": row["created_at"],
+    }
+
+
+async def _get_user_job(job_id: int, token: str):
+    user = await get_current_user(token)
+    job = await database.fetch_one(
+        select(jobs).where(
+            and_(
+                jobs.c.id == job_id,
+                jobs.c.user_id == user["id"]
+            )
+        )
+    )
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+async def load_job_gates(job_id: int):
+    """Counting gates for a job in the order counting.movement_events numbers them.
+
+    Returns (lines, zones, names): lines as a list of [[x, y], [x, y]], zones
+    as a list of point lists, and one name per gate (lines first, then zones).
+    """
+    rows = await database.fetch_all(
+        select(job_geometries).where(job_geometries.c.job_id == job_id).order_by(job_geometries.c.id)
+    )
+    line_rows = [r for r in rows if r["kind"] == "line"]
+    zone_rows = [r for r in rows if r["kind"] == "zone"]
+    lines = [json.loads(r["points"]) for r in line_rows]
+    zones = [json.loads(r["points"]) for r in zone_rows]
+    names = [r["name"] for r in line_rows + zone_rows]
+    return lines, zones, names
+
+
+@router.get("/{job_id}/geometry/")
+async def get_job_geometry(job_id: int, token: str = Depends(oauth2_scheme)):
+    """List counting lines and zones defined for a job"""
+    await _get_user_job(job_id, token)
+    rows = await database.fetch_all(
+        select(job_geometries).where(job_geometries.c.job_id == job_id).order_by(job_geometries.c.id)
+    )
+    return [_geometry_response(row) for row in rows]
+
+
+@router.post("/{job_id}/geometry/")
+async def create_job_geometry(
+    job_id: int,
+    data: GeometryCreateRequest,
+    token: str = Depends(oauth2_scheme)
+):
+    """Add a counting line or zone to a job"""
+    await _get_user_job(job_id, token)
+    row = await database.fetch_one(
+        insert(job_geometries).values(
+            job_id=job_id,
+            name=data.name,
+            kind=data.kind,
+            points=json.dumps([list(p) for p in data.points]),
+            created_at=datetime.utcnow()
+        ).returning(job_geometries)
+    )
+    return _geometry_response(row)
+
+
+@router.delete("/{job_id}/geometry/{geometry_id}")
+async def delete_job_geometry(
+    job_id: int,
+    geometry_id: int,
+    token: str = Depends(oauth2_scheme)
+):
+    """Remove a counting line or zone from a job"""
+    await _get_user_job(job_id, token)
+    deleted = await database.fetch_one(
+        delete(job_geometries).where(
+            and_(
+                job_geometries.c.id == geometry_id,
+                job_geometries.c.job_id == job_id
+            )
+        ).returning(job_geometries.c.id)
+    )
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Geometry not found")
+    return {"message": "Geometry deleted"}
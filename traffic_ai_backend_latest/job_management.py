@@ -1,6 +1,7 @@
 # job_management.py
 from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
 from fastapi.responses import FileResponse
+from fastapi.concurrency import run_in_threadpool
 from typing import List
 from datetime import datetime
 import os
@@ -10,10 +11,15 @@ import json
 
 from sqlalchemy import select, insert, update, and_
 from auth import get_current_user, oauth2_scheme  # Adjust path accordingly
-from database import database  # Adjust path accordingly
+from database import database, read_database  # Adjust path accordingly
 from models import jobs, videos, job_videos, reports, JobStatus  # Adjust path accordingly
+from video_probe import schedule_probe, video_metadata
+from count_store import get_binned_counts, BIN_MINUTES
+from progress import job_progress, video_progress
+from admission import interactive_lane
+from upload_storage import save_upload
+import summary
 import logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
@@ -26,7 +32,7 @@ REPORTS_DIR = "reports"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 os.makedirs(REPORTS_DIR, exist_ok=True)
 
-@router.get("/dashboard/")
+@router.get("/dashboard/", dependencies=[Depends(interactive_lane)])
 async def get_analyzing_jobs(token: str = Depends(oauth2_scheme)):
     """Get all jobs with status 'Analyzing' for Dashboard"""
     user = await get_current_user(token)
@@ -37,12 +43,12 @@ async def get_analyzing_jobs(token: str = Depends(oauth2_scheme)):
             jobs.c.status == JobStatus.ANALYZING.value
         )
     )
-    job_list = await database.fetch_all(query)
+    job_list = await read_database.fetch_all(query)
     
     result = []
     for job in job_list:
         video_query = select(videos).join(job_videos).where(job_videos.c.job_id == job["id"])
-        assigned_videos = await database.fetch_all(video_query)
+        assigned_videos = await read_database.fetch_all(video_query)
         
         result.append({
             "id": job["id"],
@@ -55,13 +61,44 @@ async def get_analyzing_jobs(token: str = Depends(oauth2_scheme)):
             "survey_hours": job["survey_hours"],
             "created_at": job["created_at"],
             "completed_at": job["completed_at"],
-            "videos": [{"id": v["id"], "filename": v["filename"]} for v in assigned_videos]
+            "progress": job_progress(assigned_videos),
+            "videos": [
+                {"id": v["id"], "filename": v["filename"], "progress": video_progress(v)}
+                for v in assigned_videos
+            ]
         })
     
     return result
 
+@router.get("/summary/", dependencies=[Depends(interactive_lane)])
+async def get_summary(token: str = Depends(oauth2_scheme)):
+    """Get dashboard counters and the most recent jobs"""
+    user = await get_current_user(token)
+    
+    counters = await summary.get_summary(user["id"])
+    recent_jobs = await read_database.fetch_all(
+        select(jobs.c.id, jobs.c.job_number, jobs.c.name, jobs.c.status, jobs.c.created_at)
+        .where(jobs.c.user_id == user["id"])
+        .order_by(jobs.c.created_at.desc())
+        .limit(5)
+    )
+    
+    return {
+        **counters,
+        "recent_jobs": [
+            {
+                "id": job["id"],
+                "job_number": job["job_number"],
+                "name": job["name"],
+                "status": job["status"],
+                "created_at": job["created_at"]
+            }
+            for job in recent_jobs
+        ]
+    }
+
 # Add this to your job_management.py
-@router.get("/historical/")
+@router.get("/historical/", dependencies=[Depends(interactive_lane)])
 async def get_completed_jobs(token: str = Depends(oauth2_scheme)):
     """Get all completed jobs for Historical Surveys"""
     user = await get_current_user(token)
@@ -70,12 +107,12 @@ async def get_completed_jobs(token: str = Depends(oauth2_scheme)):
         jobs.c.status == JobStatus.COMPLETE.value
     ).order_by(jobs.c.completed_at.desc())
     
-    job_list = await database.fetch_all(query)
+    job_list = await read_database.fetch_all(query)
     
     result = []
     for job in job_list:
         video_query = select(videos).join(job_videos).where(job_videos.c.job_id == job["id"])
-        assigned_videos = await database.fetch_all(video_query)
+        assigned_videos = await read_database.fetch_all(video_query)
         
         result.append({
             "id": job["id"],
@@ -131,7 +168,11 @@ async def get_job_details(
         "survey_types": survey_types,  # Add this line
         "created_at": job["created_at"],
         "completed_at": job["completed_at"],
-        "videos": [{"id": v["id"], "filename": v["filename"]} for v in assigned_videos]
+        "progress": job_progress(assigned_videos),
+        "videos": [
+            {"id": v["id"], "filename": v["filename"], **video_metadata(v), "progress": video_progress(v)}
+            for v in assigned_videos
+        ]
     }
     
     return result
@@ -160,6 +201,7 @@ class JobResponse(BaseModel):
     survey_types: Optional[List[str]] = None
     created_at: datetime
     completed_at: Optional[datetime] = None
+    progress: Optional[dict] = None
     videos: List[dict]
 
     @field_validator('survey_types', mode='before')
@@ -178,11 +220,11 @@ async def create_job(
     token: str = Depends(oauth2_scheme),
     request: Request = None
 ):
-    logger.info("Received job creation request: %s", data.dict())
+    logger.info("Received job creation request", extra={"job_number": data.job_number})
 
     try:
         user = await get_current_user(token)
-        logger.info("Authenticated user ID: %s", user["id"])
+        logger.debug("Authenticated user ID: %s", user["id"])
     except Exception as auth_error:
         logger.error("Authentication failed: %s", str(auth_error))
         raise HTTPException(status_code=401, detail="Authentication error")
@@ -221,6 +263,7 @@ async def create_job(
         ).returning(jobs)
         
         job = await database.fetch_one(job_query)
+        await summary.job_created(user["id"], initial_status)
         
         # Ensure proper response format
         return {
@@ -265,8 +308,7 @@ async def upload_job_videos(
         file_path = os.path.join(UPLOAD_DIR, unique_filename)
         
         # Save file
-        with open(file_path, "wb") as buffer:
-            buffer.write(await file.read())
+        await run_in_threadpool(save_upload, file.file, file_path)
         
         # Create video record
         video_query = insert(videos).values(
@@ -276,6 +318,7 @@ async def upload_job_videos(
             uploaded_at=datetime.utcnow()
         ).returning(videos)
         video = await database.fetch_one(video_query)
+        schedule_probe(video["id"], file_path)
         
         # Link video to job
         await database.execute(
@@ -290,6 +333,8 @@ async def upload_job_videos(
             "saved_path": file_path
         })
     
+    await summary.videos_added(user["id"], len(uploaded_files))
+    
     # Update job status to ANALYZING
     if job["status"] != JobStatus.ANALYZING.value:
         await database.execute(
@@ -297,6 +342,7 @@ async def upload_job_videos(
                 status=JobStatus.ANALYZING.value
             )
         )
+        await summary.job_status_changed(user["id"], job["status"], JobStatus.ANALYZING.value)
     
     return {"message": "Videos uploaded successfully", "files": uploaded_files}
 
@@ -322,7 +368,7 @@ async def get_job_details(job_id: int, token: str = Depends(oauth2_scheme)):
     except (json.JSONDecodeError, TypeError):
         survey_types = []
         # Optionally log the error
-        logger.warning(f"Invalid survey_types format for job {job_id}: {job['survey_types']}")
+        logger.warning("Invalid survey_types format for job %s: %s", job_id, job["survey_types"])
     
     video_query = select(videos).join(job_videos).where(job_videos.c.job_id == job_id)
     assigned_videos = await database.fetch_all(video_query)
@@ -339,7 +385,11 @@ async def get_job_details(job_id: int, token: str = Depends(oauth2_scheme)):
         "survey_types": survey_types,
         "created_at": job["created_at"],
         "completed_at": job["completed_at"],
-        "videos": [{"id": v["id"], "filename": v["filename"]} for v in assigned_videos]
+        "progress": job_progress(assigned_videos),
+        "videos": [
+            {"id": v["id"], "filename": v["filename"], **video_metadata(v), "progress": video_progress(v)}
+            for v in assigned_videos
+        ]
     }
 
 @router.get("/{job_id}/reports/")
@@ -413,18 +463,18 @@ async def download_report(
         raise HTTPException(status_code=404, detail="Report not found")
     
     file_path = report["file_path"]
-    logger.info(f"Attempting to download report from path: {file_path}")
+    logger.info("Attempting to download report from path: %s", file_path)
     
     # Check if file exists and is within the reports directory
     abs_file_path = os.path.abspath(file_path)
     abs_reports_dir = os.path.abspath(REPORTS_DIR)
     
     if not os.path.exists(abs_file_path):
-        logger.error(f"Report file not found at path: {abs_file_path}")
+        logger.error("Report file not found at path: %s", abs_file_path)
         raise HTTPException(status_code=404, detail="Report file not found")
     
     if not abs_file_path.startswith(abs_reports_dir):
-        logger.error(f"Invalid file path: {abs_file_path} is not within {abs_reports_dir}")
+        logger.error("Invalid file path: %s is not within %s", abs_file_path, abs_reports_dir)
         raise HTTPException(status_code=400, detail="Invalid file path")
     
     try:
@@ -434,9 +484,46 @@ async def download_report(
             media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
         )
     except Exception as e:
-        logger.error(f"Error serving file: {str(e)}")
+        logger.error("Error serving file: %s", str(e))
         raise HTTPException(status_code=500, detail="Error serving file")
 
+@router.get("/{job_id}/counts/")
+async def get_job_counts(
+    job_id: int,
+    interval: int = BIN_MINUTES,
+    token: str = Depends(oauth2_scheme)
+):
+    """Get movement counts for a job rolled up to `interval` minutes"""
+    user = await get_current_user(token)
+    
+    # Verify job exists and belongs to user
+    job = await database.fetch_one(
+        select(jobs).where(
+            and_(
+                jobs.c.id == job_id,
+                jobs.c.user_id == user["id"]
+            )
+        )
+    )
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    try:
+        counts = await get_binned_counts(job_id, interval)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return [
+        {
+            "bin_start": row["bin_start"],
+            "approach": row["approach"],
+            "exit": row["exit"],
+            "class_id": row["class_id"],
+            "count": row["count"]
+        }
+        for row in counts
+    ]
+
 @router.post("/{job_id}/generate-report/")
 async def generate_report(
     job_id: int,
@@ -469,7 +556,25 @@ async def generate_report(
         "Created At": [job["created_at"]],
         # Add more data as needed
     })
-    df.to_excel(report_path, index=False)
+
+    # Turning movement counts come pre-aggregated from the count store
+    counts = await get_binned_counts(job_id, BIN_MINUTES)
+
+    def write_report():
+        with pd.ExcelWriter(report_path) as writer:
+            df.to_excel(writer, sheet_name="Summary", index=False)
+            if counts:
+                counts_df = pd.DataFrame([dict(row) for row in counts])
+                counts_df.pivot_table(
+                    index="bin_start",
+                    columns=["approach", "exit", "class_id"],
+                    values="count",
+                    aggfunc="sum",
+                    fill_value=0
+                ).to_excel(writer, sheet_name="Movement Counts")
+
+    # Excel writing is CPU bound; keep it off the event loop
+    await run_in_threadpool(write_report)
     
     # Save report record
     await database.execute(
@@ -480,5 +585,6 @@ async def generate_report(
             generated_at=datetime.utcnow()
         )
     )
+    await summary.report_generated(user["id"])
     
     return {"message": "Report generated successfully", "path": report_path}
\ No newline at end of file
@@ -0,0 +1,222 @@
+# log_config.py
+import contextvars
+import json
+import logging
+import queue
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+from decouple import config
+
+# Set per request by middleware in main.py and stamped onto every record
+request_id_var = contextvars.ContextVar("request_id", default=None)
+
+LOG_LEVEL = config("LOG_LEVEL", default="INFO")
+LOG_QUEUE_SIZE = config("LOG_QUEUE_SIZE", default=10000, cast=int)
+# e.g. "auth=0.1,job_management=0.5": keep that fraction of sub-WARNING records
+LOG_SAMPLE_RATES = config("LOG_SAMPLE_RATES", default="")
+# Opt-in, e.g. "video_probe=20,progress=5": max sub-WARNING records per second
+# per message template for that logger prefix; other loggers are not limited
+LOG_RATE_LIMITS = config("LOG_RATE_LIMITS", default="")
+# How often dropped and rate-limited record counts are reported as a WARNING
+LOG_DROP_REPORT_SECONDS = config("LOG_DROP_REPORT_SECONDS", default=60, cast=float)
+
+# Attributes every LogRecord has; anything else came from `extra=` and is emitted as a field
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id"}
+
+_listener = None
+_reporter = None
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if getattr(record, "request_id", None):
+            entry["request_id"] = record.request_id
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class RequestIdFilter(logging.Filter):
+    """Capture the request id while still on the request's task"""
+
+    def filter(self, record):
+        record.request_id = request_id_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keep a fixed fraction of sub-WARNING records per logger prefix"""
+
+    def __init__(self, rates: dict):
+        super().__init__()
+        self.rates = rates
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+        name = record.name
+        while name:
+            if name in self.rates:
+                return random.random() < self.rates[name]
+            name = name.rpartition(".")[0]
+        return True
+
+
+class RateLimitFilter(logging.Filter):
+    """Token bucket per (logger, message template) for sub-WARNING records of the configured logger prefixes"""
+
+    def __init__(self, rates: dict):
+        super().__init__()
+        self.rates = rates
+        self.limited = 0
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _rate(self, name: str):
+        while name:
+            if name in self.rates:
+                return self.rates[name]
+            name = name.rpartition(".")[0]
+        return None
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+        per_second = self._rate(record.name)
+        if not per_second or per_second <= 0:
+            return True
+
+        # msg is usually a format string, but any object may be logged
+        template = record.msg if isinstance(record.msg, str) else type(record.msg).__qualname__
+        key = (record.name, template)
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (per_second, now))
+            tokens = min(per_second, tokens + (now - updated) * per_second)
+            allowed = tokens >= 1
+            self._buckets[key] = (tokens - 1 if allowed else tokens, now)
+            if not allowed:
+                self.limited += 1
+        return allowed
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """Enqueue records untouched; formatting happens on the listener thread.
+
+    The queue is bounded and never blocks: when it is full the record is
+    dropped and counted instead of stalling the caller.
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _LossReporter(threading.Thread):
+    """Periodically writes a WARNING with how many records were dropped or rate limited.
+
+    The warning goes straight to the output handler: when the queue is full
+    it would otherwise be dropped itself.
+    """
+
+    def __init__(self, handler: NonBlockingQueueHandler, limiter: RateLimitFilter, output: logging.Handler):
+        super().__init__(name="log-loss-reporter", daemon=True)
+        self.handler = handler
+        self.limiter = limiter
+        self.output = output
+        self.stopped = threading.Event()
+        self._reported = (0, 0)
+
+    def report(self):
+        totals = (self.handler.dropped, self.limiter.limited)
+        dropped, limited = (now - before for now, before in zip(totals, self._reported))
+        self._reported = totals
+        if dropped or limited:
+            record = logging.getLogger(__name__).makeRecord(
+                __name__, logging.WARNING, __file__, 0,
+                "Logging lost %d records to a full queue and %d to rate limits since the last report",
+                (dropped, limited), None,
+                extra={"dropped": dropped, "rate_limited": limited},
+            )
+            self.output.handle(record)
+
+    def run(self):
+        while not self.stopped.wait(LOG_DROP_REPORT_SECONDS):
+            self.report()
+
+
+def _parse_rates(spec: str) -> dict:
+    rates = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, rate = item.partition("=")
+        rates[name.strip()] = float(rate)
+    return rates
+
+
+def setup_logging():
+    """Route all logging through a bounded queue to a JSON writer thread. Safe to call more than once."""
+    global _listener, _reporter
+    if _listener is not None:
+        return
+
+    log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    handler = NonBlockingQueueHandler(log_queue)
+    limiter = RateLimitFilter(_parse_rates(LOG_RATE_LIMITS))
+    handler.addFilter(SamplingFilter(_parse_rates(LOG_SAMPLE_RATES)))
+    handler.addFilter(limiter)
+    handler.addFilter(RequestIdFilter())
+
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(JsonFormatter())
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(LOG_LEVEL)
+
+    # Let uvicorn's loggers go through the same queue
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        logging.getLogger(name).handlers = []
+        logging.getLogger(name).propagate = True
+
+    _listener = QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+    _reporter = _LossReporter(handler, limiter, output)
+    _reporter.start()
+
+
+def shutdown_logging():
+    """Flush queued records and stop the writer thread"""
+    global _listener, _reporter
+    if _reporter is not None:
+        _reporter.stopped.set()
+        _reporter.join()
+        _reporter.report()
+        _reporter = None
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -1,12 +1,27 @@
 # main.py
-from fastapi import FastAPI
-from database import database, engine, metadata
+import uuid
+from log_config import setup_logging, shutdown_logging, request_id_var
+
+# Configure logging before the other modules create their loggers
+setup_logging()
+
+from fastapi import FastAPI, Depends, Request
+from database import database, read_database, engine, metadata
 from auth import router as auth_router
 from video_upload import router as video_router
 from job_management import router as job_router
 from fastapi.middleware.cors import CORSMiddleware
 from videos import router as videolist_router
 from example_videos import router as example_videos_router  # Add this import
+from job_geometry import router as job_geometry_router
+from bulk_export import router as bulk_export_router
+from search import router as search_router
+from video_probe import shutdown_probe_pool
+from progress import progress
+from admission import AdmissionMiddleware, upload_lane, report_lane, interactive_lane, client_key
+from read_routing import current_client
+from summary import start_reconciler, stop_reconciler
+from storage_tiering import start_tiering, stop_tiering
 
 app = FastAPI()
 
@@ -14,6 +29,17 @@ app = FastAPI()
 #metadata.drop_all(engine) +
 metadata.create_all(engine)
 
+# Heavy lanes are enforced before the request body is read, so a rejected upload is never spooled
+app.add_middleware(
+    AdmissionMiddleware,
+    routes=[
+        ("POST", r"/videos/upload/?", upload_lane),
+        ("POST", r"/jobs/\d+/upload-videos/?", upload_lane),
+        ("POST", r"/jobs/\d+/generate-report/?", report_lane),
+        ("POST", r"/jobs/export/?", report_lane),
+    ]
+)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # Allow all origins (for development)
@@ -22,17 +48,49 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def assign_request_id(request: Request, call_next):
+    """Tag every log record for this request with a request id, echoed back to the client"""
+    request_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex
+    request_id_var.set(request_id)
+    response = await call_next(request)
+    response.headers["X-Request-ID"] = request_id
+    return response
+
+@app.middleware("http")
+async def track_writes(request: Request, call_next):
+    """Remember who made a successful write so their next reads skip the replicas"""
+    client = client_key(request)
+    current_client.set(client)
+    response = await call_next(request)
+    if request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400:
+        read_database.record_write(client)
+    return response
+
 @app.on_event("startup")
 async def startup():
     await database.connect()
+    await read_database.connect()
+    progress.start()
+    start_reconciler()
+    start_tiering()
 
 @app.on_event("shutdown")
 async def shutdown():
+    stop_reconciler()
+    stop_tiering()
+    await progress.stop()
+    await read_database.disconnect()
     await database.disconnect()
+    shutdown_probe_pool()
+    shutdown_logging()
 
 # Include all routes
-app.include_router(auth_router, prefix="/auth")
+app.include_router(auth_router, prefix="/auth", dependencies=[Depends(interactive_lane)])
 app.include_router(video_router, prefix="/videos")
 app.include_router(job_router, prefix="/jobs")
+app.include_router(job_geometry_router, prefix="/jobs")
+app.include_router(bulk_export_router, prefix="/jobs")
 app.include_router(videolist_router, prefix="/videolist")
+app.include_router(search_router, prefix="/search", dependencies=[Depends(interactive_lane)])
 app.include_router(example_videos_router, prefix="/example-videos")  # Add this line
\ No newline at end of file
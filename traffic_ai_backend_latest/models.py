@@ -1,5 +1,5 @@
 # models.py
-from sqlalchemy import Table, Column, Integer, String, ForeignKey, DateTime, Enum, Boolean
+from sqlalchemy import Table, Column, Integer, String, ForeignKey, DateTime, Enum, Boolean, Float, UniqueConstraint
 from sqlalchemy.orm import registry
 from database import metadata
 import datetime
@@ -25,18 +25,34 @@ videos = Table(
     "videos",
     metadata,
     Column("id", Integer, primary_key=True, index=True),
-    Column("user_id", Integer, ForeignKey("users.id")),
+    Column("user_id", Integer, ForeignKey("users.id"), index=True),
     Column("filename", String, nullable=False),
     Column("file_path", String, nullable=False),
     Column("uploaded_at", DateTime, default=datetime.datetime.utcnow),
     Column("processed", Integer, default=0),
+    # Filled in asynchronously by video_probe after upload
+    Column("duration_seconds", Float),
+    Column("fps", Float),
+    Column("frame_count", Integer),
+    Column("width", Integer),
+    Column("height", Integer),
+    Column("codec", String),
+    Column("probed_at", DateTime),
+    # Analysis progress, flushed periodically by progress.ProgressAggregator
+    Column("frames_processed", Integer, default=0),
+    Column("frames_total", Integer),
+    Column("processing_fps", Float),
+    Column("progress_updated_at", DateTime),
+    # Hot/cold placement of the raw file, managed by storage_tiering
+    Column("storage_tier", String, default="hot"),
+    Column("last_accessed_at", DateTime),
 )
 
 jobs = Table(
     "jobs",
     metadata,
     Column("id", Integer, primary_key=True, index=True),
-    Column("user_id", Integer, ForeignKey("users.id")),
+    Column("user_id", Integer, ForeignKey("users.id"), index=True),
     Column("job_number", String, unique=True, index=True),
     Column("name", String, nullable=False),
     Column("status", Enum(JobStatus), default=JobStatus.PENDING.value),
@@ -67,6 +83,47 @@ reports = Table(
     Column("generated_at", DateTime, default=datetime.datetime.utcnow),
 )
 
+job_geometries = Table(
+    "job_geometries",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("job_id", Integer, ForeignKey("jobs.id"), nullable=False, index=True),
+    Column("name", String, nullable=False),  # e.g., "North approach"
+    Column("kind", String, nullable=False),  # "line" or "zone"
+    Column("points", String, nullable=False),  # JSON list of [x, y] in frame pixels
+    Column("created_at", DateTime, default=datetime.datetime.utcnow),
+)
+
+movement_counts = Table(
+    "movement_counts",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("job_id", Integer, ForeignKey("jobs.id"), nullable=False),
+    Column("video_id", Integer, ForeignKey("videos.id"), nullable=False),  # source video, so re-counting one replaces its bins
+    Column("bin_start", DateTime, nullable=False),  # start of a 15-minute bin
+    Column("approach", String, nullable=False),
+    Column("exit", String, nullable=False),
+    Column("class_id", Integer, nullable=False),
+    Column("count", Integer, nullable=False, default=0),
+    UniqueConstraint("job_id", "video_id", "bin_start", "approach", "exit", "class_id", name="uq_movement_counts_bin"),
+)
+
+# Per-user counters behind /jobs/summary/, maintained by summary.py
+user_summaries = Table(
+    "user_summaries",
+    metadata,
+    Column("user_id", Integer, ForeignKey("users.id"), primary_key=True),
+    Column("jobs_pending", Integer, nullable=False, default=0),
+    Column("jobs_analyzing", Integer, nullable=False, default=0),
+    Column("jobs_complete", Integer, nullable=False, default=0),
+    Column("videos_total", Integer, nullable=False, default=0),
+    Column("videos_pending", Integer, nullable=False, default=0),
+    Column("reports_total", Integer, nullable=False, default=0),
+    Column("reports_week_start", DateTime),  # week that reports_this_week counts
+    Column("reports_this_week", Integer, nullable=False, default=0),
+    Column("updated_at", DateTime, default=datetime.datetime.utcnow),
+)
+
 example_videos = Table(
     "example_videos",
     metadata,
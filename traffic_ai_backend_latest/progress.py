@@ -0,0 +1,188 @@
+# progress.py
+import asyncio
+import logging
+import threading
+import time
+from datetime import datetime
+
+from decouple import config
+from sqlalchemy import update, func
+
+from database import database
+from models import videos
+
+logger = logging.getLogger(__name__)
+
+# Minimum seconds between progress writes to the database
+PROGRESS_FLUSH_SECONDS = config("PROGRESS_FLUSH_SECONDS", default=5, cast=float)
+
+# Weight of the newest sample in the smoothed frames/sec
+THROUGHPUT_SMOOTHING = 0.3
+
+
+class ProgressAggregator:
+    """Collects per-video progress in memory and writes it out in batches.
+
+    report()/advance() are cheap and thread-safe so workers can call them
+    per frame or per segment; the database only sees one transaction per
+    flush interval covering the videos that changed.
+    """
+
+    def __init__(self, flush_interval: float = PROGRESS_FLUSH_SECONDS):
+        self.flush_interval = flush_interval
+        self._lock = threading.RLock()
+        self._state = {}
+        self._dirty = set()
+        self._task = None
+
+    def report(self, video_id: int, frames_processed: int, frames_total: int = None):
+        """Set the absolute number of frames processed for a video"""
+        now = time.monotonic()
+        with self._lock:
+            state = self._state.setdefault(
+                video_id, {"processed": 0, "total": None, "fps": None, "sampled_at": now, "sampled_frames": 0}
+            )
+            if frames_total is not None:
+                state["total"] = frames_total
+            state["processed"] = frames_processed
+
+            elapsed = now - state["sampled_at"]
+            if elapsed >= 1.0:
+                rate = (frames_processed - state["sampled_frames"]) / elapsed
+                state["fps"] = rate if state["fps"] is None else (
+                    THROUGHPUT_SMOOTHING * rate + (1 - THROUGHPUT_SMOOTHING) * state["fps"]
+                )
+                state["sampled_at"] = now
+                state["sampled_frames"] = frames_processed
+            self._dirty.add(video_id)
+
+    def seed(self, video_id: int, frames_processed: int, frames_total: int = None):
+        """Set a video's count without counting it as throughput, e.g. work restored on resume"""
+        self.report(video_id, frames_processed, frames_total)
+        with self._lock:
+            state = self._state[video_id]
+            state["sampled_at"] = time.monotonic()
+            state["sampled_frames"] = frames_processed
+
+    def advance(self, video_id: int, frames: int, frames_total: int = None):
+        """Add frames to a video's processed count"""
+        with self._lock:
+            current = self._state.get(video_id, {}).get("processed", 0)
+            self.report(video_id, current + frames, frames_total)
+
+    def segment_callback(self, video_id: int, frames_total: int = None):
+        """on_segment_done callback for segment_analysis.analyze_video.
+
+        The count is rebuilt from the segments seen so far, and analyze_video
+        reports checkpointed segments first on resume, so a resumed video
+        starts from the work already done instead of from zero.
+        """
+        done = {}
+
+        def on_segment_done(segment, resumed=False):
+            done[segment.index] = segment.end_frame - segment.start_frame
+            (self.seed if resumed else self.report)(video_id, sum(done.values()), frames_total)
+        return on_segment_done
+
+    def finish(self, video_id: int):
+        """Mark a video as fully processed and stop tracking it after the next flush"""
+        with self._lock:
+            state = self._state.get(video_id)
+            if state and state["total"] is not None:
+                state["processed"] = state["total"]
+            if state:
+                state["finished"] = True
+                self._dirty.add(video_id)
+
+    async def flush(self):
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+            rows = [
+                {
+                    "video_id": video_id,
+                    "frames_processed": self._state[video_id]["processed"],
+                    "frames_total": self._state[video_id]["total"],
+                    "processing_fps": self._state[video_id]["fps"],
+                    "progress_updated_at": datetime.utcnow(),
+                }
+                for video_id in dirty
+            ]
+
+        if not rows:
+            return
+        try:
+            async with database.transaction():
+                for row in rows:
+                    await database.execute(
+                        update(videos).where(videos.c.id == row["video_id"]).values(
+                            frames_processed=row["frames_processed"],
+                            # Keep the stored total (or the probed frame count) when a report doesn't carry one
+                            frames_total=row["frames_total"] if row["frames_total"] is not None
+                            else func.coalesce(videos.c.frames_total, videos.c.frame_count),
+                            processing_fps=row["processing_fps"],
+                            progress_updated_at=row["progress_updated_at"],
+                        )
+                    )
+        except Exception:
+            # Retry these videos on the next flush
+            with self._lock:
+                self._dirty.update(dirty)
+            raise
+
+        with self._lock:
+            for video_id in dirty:
+                if self._state[video_id].get("finished") and video_id not in self._dirty:
+                    del self._state[video_id]
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error("Progress flush failed: %s", str(e))
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error("Final progress flush failed: %s", str(e))
+
+
+progress = ProgressAggregator()
+
+
+def video_progress(video) -> dict:
+    total = video["frames_total"] or video["frame_count"]
+    processed = video["frames_processed"] or 0
+    fps = video["processing_fps"]
+    return {
+        "frames_processed": processed,
+        "frames_total": total,
+        "percent": round(100.0 * processed / total, 1) if total else None,
+        "frames_per_second": fps,
+        "eta_seconds": round((total - processed) / fps) if total and fps else None,
+    }
+
+
+def job_progress(assigned_videos) -> dict:
+    """Roll per-video progress up to a job; videos are analyzed concurrently so throughput adds up"""
+    per_video = [video_progress(v) for v in assigned_videos]
+    processed = sum(p["frames_processed"] for p in per_video)
+    totals = [p["frames_total"] for p in per_video]
+    total = sum(totals) if totals and all(totals) else None
+    fps = sum(p["frames_per_second"] or 0 for p in per_video if p["frames_total"] and p["frames_processed"] < p["frames_total"])
+    return {
+        "frames_processed": processed,
+        "frames_total": total,
+        "percent": round(100.0 * processed / total, 1) if total else None,
+        "frames_per_second": fps or None,
+        "eta_seconds": round((total - processed) / fps) if total and fps else None,
+    }
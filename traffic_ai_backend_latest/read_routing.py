@@ -0,0 +1,118 @@
+# read_routing.py
+import asyncio
+import contextvars
+import itertools
+import logging
+import time
+
+from databases import Database
+
+logger = logging.getLogger(__name__)
+
+# Caller of the current request (see admission.client_key), set by middleware in main.py
+current_client = contextvars.ContextVar("current_client", default=None)
+
+# Seconds behind the primary; 0 when the replica has replayed everything it received
+LAG_QUERY = """
+SELECT COALESCE(
+    CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+         ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END, 0)
+"""
+
+
+class ReadRouter:
+    """Sends read-only queries to healthy replicas and everything else to the primary.
+
+    A caller that wrote within max_lag seconds reads from the primary so it
+    sees its own writes. Replicas are health-checked in the background and
+    taken out of rotation when unreachable or lagging more than max_lag; a
+    query that fails on a replica is retried once on the primary.
+    """
+
+    def __init__(self, primary: Database, replica_urls, max_lag: float = 5.0, health_interval: float = 5.0):
+        self.primary = primary
+        self.replicas = [Database(url) for url in replica_urls]
+        self.max_lag = max_lag
+        self.health_interval = health_interval
+        self._healthy = set()
+        self._rotation = itertools.count()
+        self._last_write = {}
+        self._task = None
+
+    async def connect(self):
+        for replica in self.replicas:
+            try:
+                await replica.connect()
+            except Exception as e:
+                logger.warning("Replica %s unavailable at startup: %s", replica.url, str(e))
+        await self.check_health()
+        if self.replicas and self._task is None:
+            self._task = asyncio.create_task(self._run_health_checks())
+
+    async def disconnect(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for replica in self.replicas:
+            if replica.is_connected:
+                await replica.disconnect()
+
+    async def check_health(self):
+        healthy = set()
+        for index, replica in enumerate(self.replicas):
+            try:
+                if not replica.is_connected:
+                    await replica.connect()
+                lag = await replica.fetch_val(LAG_QUERY)
+                if lag is not None and float(lag) > self.max_lag:
+                    logger.warning("Replica %s is %.1fs behind, routing reads to primary", replica.url, float(lag))
+                    continue
+                healthy.add(index)
+            except Exception as e:
+                logger.warning("Replica %s failed health check: %s", replica.url, str(e))
+        self._healthy = healthy
+
+    async def _run_health_checks(self):
+        while True:
+            await asyncio.sleep(self.health_interval)
+            await self.check_health()
+
+    def record_write(self, client=None):
+        """Pin a caller's reads to the primary for the lag window"""
+        client = client or current_client.get()
+        if client is None:
+            return
+        now = time.monotonic()
+        self._last_write[client] = now
+        if len(self._last_write) > 10000:
+            self._last_write = {k: t for k, t in self._last_write.items() if now - t < self.max_lag}
+
+    def _pick(self):
+        client = current_client.get()
+        wrote_at = self._last_write.get(client) if client is not None else None
+        if wrote_at is not None and time.monotonic() - wrote_at < self.max_lag:
+            return None
+        healthy = sorted(self._healthy)
+        if not healthy:
+            return None
+        return healthy[next(self._rotation) % len(healthy)]
+
+    async def _read(self, method: str, query, values=None):
+        index = self._pick()
+        if index is not None:
+            try:
+                return await getattr(self.replicas[index], method)(query, values)
+            except Exception as e:
+                logger.warning("Read on replica %s failed, retrying on primary: %s", self.replicas[index].url, str(e))
+                self._healthy.discard(index)
+        return await getattr(self.primary, method)(query, values)
+
+    async def fetch_all(self, query, values=None):
+        return await self._read("fetch_all", query, values)
+
+    async def fetch_one(self, query, values=None):
+        return await self._read("fetch_one", query, values)
+
+    async def fetch_val(self, query, values=None):
+        return await self._read("fetch_val", query, values)
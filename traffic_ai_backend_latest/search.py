@@ -0,0 +1,112 @@
+# search.py
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select, func, literal, or_, union_all, cast, String, Integer
+
+from auth import get_current_user, oauth2_scheme
+from database import read_database
+from models import jobs, videos
+
+router = APIRouter()
+
+
+def _escape_like(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _score(column, q: str):
+    """Rank exact > prefix > fuzzy; fuzzy uses trigram similarity"""
+    prefix = _escape_like(q) + "%"
+    return func.greatest(
+        func.similarity(column, q),
+        func.coalesce((func.lower(column) == q.lower()).cast(Integer) * 2.0, 0),
+        func.coalesce(column.ilike(prefix, escape="\\").cast(Integer) * 1.5, 0),
+    )
+
+
+def _matches(column, q: str):
+    # Both operators are served by the gin_trgm_ops indexes
+    return or_(column.ilike(_escape_like(q) + "%", escape="\\"), column.op("%")(q))
+
+
+def _video_query(user_id: int, q: str):
+    score = _score(videos.c.filename, q)
+    return (
+        select(
+            literal("video").label("type"),
+            videos.c.id,
+            videos.c.filename.label("title"),
+            cast(videos.c.uploaded_at, String).label("detail"),
+            score.label("score"),
+        )
+        .where(videos.c.user_id == user_id)
+        .where(_matches(videos.c.filename, q))
+    )
+
+
+def _job_query(user_id: int, q: str):
+    # Notes are long free text, so they are matched on the best-matching word run
+    notes_score = func.word_similarity(q, jobs.c.additional_notes)
+    score = func.greatest(_score(jobs.c.name, q), _score(jobs.c.job_number, q), func.coalesce(notes_score, 0))
+    return (
+        select(
+            literal("job").label("type"),
+            jobs.c.id,
+            jobs.c.name.label("title"),
+            jobs.c.job_number.label("detail"),
+            score.label("score"),
+        )
+        .where(jobs.c.user_id == user_id)
+        .where(or_(
+            _matches(jobs.c.name, q),
+            _matches(jobs.c.job_number, q),
+            literal(q).op("<%")(jobs.c.additional_notes),
+        ))
+    )
+
+
+@router.get("/")
+async def search(
+    q: str = Query(..., min_length=2),
+    kind: Literal["all", "videos", "jobs"] = "all",
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    token: str = Depends(oauth2_scheme)
+):
+    """Ranked prefix and fuzzy search over the caller's videos and jobs"""
+    user = await get_current_user(token)
+    q = q.strip()
+    if len(q) < 2:
+        raise HTTPException(status_code=400, detail="Query too short")
+
+    parts = []
+    if kind in ("all", "videos"):
+        parts.append(_video_query(user["id"], q))
+    if kind in ("all", "jobs"):
+        parts.append(_job_query(user["id"], q))
+    combined = (union_all(*parts) if len(parts) > 1 else parts[0]).subquery()
+
+    query = (
+        select(combined)
+        .order_by(combined.c.score.desc(), combined.c.type, combined.c.id)
+        .limit(limit)
+        .offset(offset)
+    )
+    rows = await read_database.fetch_all(query)
+
+    return {
+        "query": q,
+        "limit": limit,
+        "offset": offset,
+        "results": [
+            {
+                "type": row["type"],
+                "id": row["id"],
+                "title": row["title"],
+                "detail": row["detail"],
+                "score": round(float(row["score"]), 3),
+            }
+            for row in rows
+        ],
+    }
@@ -0,0 +1,207 @@
+# segment_analysis.py
+import asyncio
+import json
+import logging
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, List, NamedTuple, Optional
+
+import numpy as np
+from decouple import config
+
+logger = logging.getLogger(__name__)
+
+# Length of each analysis segment and how far each one reads back into the
+# previous segment so stateful (class) analyzers can warm up before their own frames
+SEGMENT_SECONDS = config("SEGMENT_SECONDS", default=300, cast=float)
+SEGMENT_OVERLAP_SECONDS = config("SEGMENT_OVERLAP_SECONDS", default=2, cast=float)
+ANALYSIS_WORKERS = config("ANALYSIS_WORKERS", default=os.cpu_count() or 1, cast=int)
+
+# Per-detection layout returned by frame analyzers: x1, y1, x2, y2, score, class_id
+DETECTION_WIDTH = 6
+
+PLAN_FILENAME = "plan.json"
+
+
+class Segment(NamedTuple):
+    index: int
+    start_frame: int  # first frame owned by this segment
+    end_frame: int  # exclusive
+    read_from: int  # first frame decoded for class analyzers (start_frame minus overlap)
+
+
+def plan_segments(frame_count: int, fps: float, segment_seconds: float = None, overlap_seconds: float = None) -> List[Segment]:
+    """Split a video into fixed-length segments with a read-back overlap"""
+    segment_seconds = segment_seconds or SEGMENT_SECONDS
+    overlap_seconds = SEGMENT_OVERLAP_SECONDS if overlap_seconds is None else overlap_seconds
+
+    segment_frames = max(1, int(round(segment_seconds * fps)))
+    overlap_frames = max(0, int(round(overlap_seconds * fps)))
+
+    segments = []
+    for index, start in enumerate(range(0, frame_count, segment_frames)):
+        end = min(start + segment_frames, frame_count)
+        segments.append(Segment(index, start, end, max(0, start - overlap_frames)))
+    return segments
+
+
+def checkpoint_dir(video_path: str) -> str:
+    """Directory holding per-segment checkpoints, kept next to the upload's hot path"""
+    return f"{video_path}.segments"
+
+
+def _checkpoint_path(directory: str, index: int) -> str:
+    return os.path.join(directory, f"segment_{index:05d}.npz")
+
+
+def _prepare_checkpoints(video_path: str, segments: List[Segment], resume: bool) -> str:
+    """Create the checkpoint directory, discarding it if the plan changed"""
+    directory = checkpoint_dir(video_path)
+    plan = [list(s) for s in segments]
+    plan_path = os.path.join(directory, PLAN_FILENAME)
+
+    if os.path.isdir(directory):
+        try:
+            with open(plan_path) as f:
+                same_plan = json.load(f) == plan
+        except (OSError, json.JSONDecodeError):
+            same_plan = False
+        if not resume or not same_plan:
+            shutil.rmtree(directory)
+
+    os.makedirs(directory, exist_ok=True)
+    with open(plan_path, "w") as f:
+        json.dump(plan, f)
+    return directory
+
+
+def _process_segment(video_path: str, segment: Segment, frame_analyzer: Callable, output_path: str) -> int:
+    """Decode one segment, run the analyzer on each frame and write a checkpoint.
+
+    A class analyzer gets a fresh instance that is first fed the overlap
+    frames so its temporal state is warm at start_frame; a plain function is
+    stateless, so the overlap is not decoded at all. Only frames the segment
+    owns are checkpointed, so segments never overlap in the merged output.
+    """
+    import cv2
+
+    stateful = isinstance(frame_analyzer, type)
+    analyzer = frame_analyzer() if stateful else frame_analyzer
+    read_from = segment.read_from if stateful else segment.start_frame
+
+    capture = cv2.VideoCapture(video_path)
+    if not capture.isOpened():
+        raise ValueError(f"Unable to open video: {video_path}")
+
+    frame_chunks = []
+    detection_chunks = []
+    try:
+        capture.set(cv2.CAP_PROP_POS_FRAMES, read_from)
+        for frame_index in range(read_from, segment.end_frame):
+            ok, frame = capture.read()
+            if not ok:
+                break
+            result = analyzer(frame_index, frame)
+            if frame_index < segment.start_frame:
+                continue  # warm-up only
+            detections = np.asarray(result, dtype=np.float32).reshape(-1, DETECTION_WIDTH)
+            if len(detections):
+                frame_chunks.append(np.full(len(detections), frame_index, dtype=np.int64))
+                detection_chunks.append(detections)
+    finally:
+        capture.release()
+
+    frames = np.concatenate(frame_chunks) if frame_chunks else np.empty(0, dtype=np.int64)
+    detections = np.concatenate(detection_chunks) if detection_chunks else np.empty((0, DETECTION_WIDTH), dtype=np.float32)
+
+    # Write to a temp file first so a crash never leaves a half-written checkpoint
+    tmp_path = f"{output_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez(f, frames=frames, detections=detections)
+    os.replace(tmp_path, output_path)
+    return len(frames)
+
+
+def merge_segments(directory: str, segments: List[Segment]):
+    """Concatenate segment checkpoints in frame order"""
+    frame_parts = []
+    detection_parts = []
+    for segment in segments:
+        with np.load(_checkpoint_path(directory, segment.index)) as data:
+            frame_parts.append(data["frames"])
+            detection_parts.append(data["detections"])
+
+    if not frame_parts:
+        return np.empty(0, dtype=np.int64), np.empty((0, DETECTION_WIDTH), dtype=np.float32)
+    return np.concatenate(frame_parts), np.concatenate(detection_parts)
+
+
+def analyze_video(
+    video_path: str,
+    frame_analyzer: Callable,
+    frame_count: Optional[int] = None,
+    fps: Optional[float] = None,
+    workers: Optional[int] = None,
+    resume: bool = True,
+    on_segment_done: Optional[Callable] = None,
+):
+    """Analyze a video segment by segment across a process pool.
+
+    frame_analyzer(frame_index, frame) must be a module-level function (so it
+    can be pickled) returning an (N, 6) array of x1, y1, x2, y2, score, class_id,
+    or a module-level class whose instances are such callables; a class is
+    instantiated once per segment and warmed up on the overlap frames.
+    Returns (frames, detections) sorted by frame. Completed segments are
+    checkpointed next to the video and skipped when the call is repeated.
+    on_segment_done(segment, resumed) is called as each segment finishes,
+    and up front with resumed=True for segments restored from checkpoints.
+    For stored uploads use analyze_stored_video(), which recalls archived
+    videos first.
+    """
+    if frame_count is None or not fps:
+        from video_probe import probe_video_file
+
+        metadata = probe_video_file(video_path)
+        frame_count = frame_count or metadata["frame_count"]
+        fps = fps or metadata["fps"]
+    if not frame_count or not fps:
+        raise ValueError(f"Cannot determine frame count/fps for {video_path}")
+
+    segments = plan_segments(frame_count, fps)
+    directory = _prepare_checkpoints(video_path, segments, resume)
+
+    todo = [s for s in segments if not os.path.exists(_checkpoint_path(directory, s.index))]
+    if len(todo) < len(segments):
+        logger.info("Resuming %s: %d of %d segments already done", video_path, len(segments) - len(todo), len(segments))
+        if on_segment_done is not None:
+            for segment in segments:
+                if segment not in todo:
+                    on_segment_done(segment, resumed=True)
+
+    if todo:
+        with ProcessPoolExecutor(max_workers=min(workers or ANALYSIS_WORKERS, len(todo))) as pool:
+            futures = {
+                pool.submit(_process_segment, video_path, s, frame_analyzer, _checkpoint_path(directory, s.index)): s
+                for s in todo
+            }
+            for future in as_completed(futures):
+                segment = futures[future]
+                future.result()
+                if on_segment_done is not None:
+                    on_segment_done(segment, resumed=False)
+
+    return merge_segments(directory, segments)
+
+
+async def analyze_stored_video(video_id: int, frame_analyzer: Callable, **options):
+    """analyze_video() for an uploaded video, recalling it from cold storage if needed"""
+    from storage_tiering import ensure_hot
+
+    video_path = await ensure_hot(video_id)
+    return await asyncio.to_thread(analyze_video, video_path, frame_analyzer, **options)
+
+
+def clear_checkpoints(video_path: str):
+    """Remove segment checkpoints once merged results have been stored elsewhere"""
+    shutil.rmtree(checkpoint_dir(video_path), ignore_errors=True)
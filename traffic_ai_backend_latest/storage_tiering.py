@@ -0,0 +1,222 @@
+# storage_tiering.py
+import asyncio
+import gzip
+import logging
+import os
+import shutil
+from datetime import datetime, timedelta
+
+from decouple import config
+from sqlalchemy import select, update, and_, exists, not_, func
+
+from database import database
+from models import videos, jobs, job_videos, JobStatus
+from job_management import UPLOAD_DIR
+
+logger = logging.getLogger(__name__)
+
+HOT_TIER = "hot"
+COLD_TIER = "cold"
+
+# Second directory standing in for archive storage
+COLD_STORAGE_DIR = config("COLD_STORAGE_DIR", default="cold_storage")
+# Videos of completed jobs move to cold storage once both of these have passed
+COLD_AFTER_DAYS = config("COLD_AFTER_DAYS", default=30, cast=float)
+COLD_IDLE_DAYS = config("COLD_IDLE_DAYS", default=7, cast=float)
+# When hot storage exceeds this, completed jobs' videos are archived least recently used first (0 = no cap)
+HOT_MAX_BYTES = config("HOT_MAX_BYTES", default=0, cast=int)
+TIERING_INTERVAL_SECONDS = config("TIERING_INTERVAL_SECONDS", default=3600, cast=float)
+COLD_COMPRESSION_LEVEL = config("COLD_COMPRESSION_LEVEL", default=6, cast=int)
+
+os.makedirs(COLD_STORAGE_DIR, exist_ok=True)
+
+# Fixed pool of locks shared by video id, so memory stays bounded however many videos are touched
+LOCK_STRIPES = 64
+_locks = [asyncio.Lock() for _ in range(LOCK_STRIPES)]
+_task = None
+
+
+def _compress(source: str, target: str):
+    tmp = f"{target}.tmp"
+    with open(source, "rb") as src, gzip.open(tmp, "wb", compresslevel=COLD_COMPRESSION_LEVEL) as dst:
+        shutil.copyfileobj(src, dst, 1024 * 1024)
+    with open(tmp, "rb") as f:
+        os.fsync(f.fileno())
+    os.replace(tmp, target)
+
+
+def _decompress(source: str, target: str):
+    tmp = f"{target}.tmp"
+    with gzip.open(source, "rb") as src, open(tmp, "wb") as dst:
+        shutil.copyfileobj(src, dst, 1024 * 1024)
+        dst.flush()
+        os.fsync(dst.fileno())
+    os.replace(tmp, target)
+
+
+def _video_lock(video_id: int) -> asyncio.Lock:
+    return _locks[video_id % LOCK_STRIPES]
+
+
+def _file_size(path: str) -> int:
+    return os.path.getsize(path) if os.path.exists(path) else 0
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def hot_path(video) -> str:
+    """Where a video lives in hot storage, whichever tier it is in now.
+
+    Sidecar files (detection archives, segment checkpoints) are keyed by
+    this path rather than by file_path, so they stay in hot storage and
+    keep working while the video itself is archived; ensure_hot() recalls
+    the video to the same path.
+    """
+    path = video["file_path"]
+    if (video["storage_tier"] or HOT_TIER) != COLD_TIER:
+        return path
+    name = os.path.basename(path)
+    return os.path.join(UPLOAD_DIR, name[:-3] if name.endswith(".gz") else name)
+
+
+async def archive_video(video_id: int) -> bool:
+    """Compress a hot video into cold storage and repoint its row.
+
+    The row is only switched if it still points at the hot file, and the
+    hot file is only deleted after the switch, so readers always see a
+    path that exists. Sidecar files are left in place (see hot_path).
+    """
+    async with _video_lock(video_id):
+        video = await database.fetch_one(select(videos).where(videos.c.id == video_id))
+        if not video or (video["storage_tier"] or HOT_TIER) != HOT_TIER or not os.path.exists(video["file_path"]):
+            return False
+
+        hot_path = video["file_path"]
+        cold_path = os.path.join(COLD_STORAGE_DIR, os.path.basename(hot_path) + ".gz")
+        await asyncio.to_thread(_compress, hot_path, cold_path)
+
+        switched = await database.fetch_one(
+            update(videos)
+            .where(and_(videos.c.id == video_id, videos.c.file_path == hot_path))
+            .values(file_path=cold_path, storage_tier=COLD_TIER)
+            .returning(videos.c.id)
+        )
+        if not switched:
+            await asyncio.to_thread(_remove, cold_path)
+            return False
+
+        await asyncio.to_thread(_remove, hot_path)
+        logger.info("Archived video %s to %s", video_id, cold_path)
+        return True
+
+
+async def ensure_hot(video_id: int) -> str:
+    """Hot path of a video, recalling it from cold storage if needed; also records the access"""
+    async with _video_lock(video_id):
+        video = await database.fetch_one(select(videos).where(videos.c.id == video_id))
+        if not video:
+            raise FileNotFoundError(f"Video {video_id} not found")
+
+        path = hot_path(video)
+        if (video["storage_tier"] or HOT_TIER) == COLD_TIER:
+            cold_path = video["file_path"]
+            await asyncio.to_thread(_decompress, cold_path, path)
+            await database.execute(
+                update(videos).where(videos.c.id == video_id).values(
+                    file_path=path, storage_tier=HOT_TIER, last_accessed_at=datetime.utcnow()
+                )
+            )
+            await asyncio.to_thread(_remove, cold_path)
+            logger.info("Recalled video %s to %s", video_id, path)
+        else:
+            await database.execute(
+                update(videos).where(videos.c.id == video_id).values(last_accessed_at=datetime.utcnow())
+            )
+        return path
+
+
+def _archivable():
+    """Hot videos whose every linked job is complete"""
+    unfinished_job = exists().where(and_(
+        job_videos.c.video_id == videos.c.id,
+        job_videos.c.job_id == jobs.c.id,
+        jobs.c.status != JobStatus.COMPLETE.value,
+    ))
+    return and_(
+        func.coalesce(videos.c.storage_tier, HOT_TIER) == HOT_TIER,
+        exists().where(job_videos.c.video_id == videos.c.id),
+        not_(unfinished_job),
+    )
+
+
+async def run_tiering_pass():
+    """Apply the retention rule, then the hot-capacity rule"""
+    now = datetime.utcnow()
+    last_used = func.coalesce(videos.c.last_accessed_at, videos.c.uploaded_at)
+    latest_completion = (
+        select(func.max(jobs.c.completed_at))
+        .select_from(job_videos.join(jobs, job_videos.c.job_id == jobs.c.id))
+        .where(job_videos.c.video_id == videos.c.id)
+        .scalar_subquery()
+    )
+
+    # Retention: completed long enough ago and not touched recently
+    expired = await database.fetch_all(
+        select(videos.c.id).where(and_(
+            _archivable(),
+            latest_completion < now - timedelta(days=COLD_AFTER_DAYS),
+            last_used < now - timedelta(days=COLD_IDLE_DAYS),
+        )).order_by(last_used)
+    )
+    archived = 0
+    for row in expired:
+        archived += await archive_video(row["id"])
+
+    # Capacity: archive least recently used completed videos until hot storage fits
+    if HOT_MAX_BYTES:
+        hot_rows = await database.fetch_all(
+            select(videos.c.file_path).where(func.coalesce(videos.c.storage_tier, HOT_TIER) == HOT_TIER)
+        )
+        hot_bytes = await asyncio.to_thread(lambda: sum(_file_size(r["file_path"]) for r in hot_rows))
+        if hot_bytes > HOT_MAX_BYTES:
+            candidates = await database.fetch_all(
+                select(videos.c.id, videos.c.file_path).where(_archivable()).order_by(last_used)
+            )
+            for row in candidates:
+                if hot_bytes <= HOT_MAX_BYTES:
+                    break
+                size = await asyncio.to_thread(_file_size, row["file_path"])
+                if await archive_video(row["id"]):
+                    hot_bytes -= size
+                    archived += 1
+
+    if archived:
+        logger.info("Tiering pass archived %d videos", archived)
+    return archived
+
+
+async def _run_tiering():
+    while True:
+        try:
+            await run_tiering_pass()
+        except Exception as e:
+            logger.error("Tiering pass failed: %s", str(e))
+        await asyncio.sleep(TIERING_INTERVAL_SECONDS)
+
+
+def start_tiering():
+    global _task
+    if _task is None:
+        _task = asyncio.create_task(_run_tiering())
+
+
+def stop_tiering():
+    global _task
+    if _task is not None:
+        _task.cancel()
+        _task = None
@@ -0,0 +1,200 @@
+# summary.py
+import asyncio
+import logging
+from datetime import datetime, timedelta
+
+from decouple import config
+from sqlalchemy import select, func, case, or_, literal, DateTime
+from sqlalchemy.dialects.postgresql import insert
+
+from database import database
+from models import users, jobs, videos, reports, user_summaries, JobStatus
+
+logger = logging.getLogger(__name__)
+
+# How often counters are recomputed from the source tables to correct drift
+SUMMARY_RECONCILE_SECONDS = config("SUMMARY_RECONCILE_SECONDS", default=3600, cast=float)
+
+STATUS_COLUMNS = {
+    JobStatus.PENDING.value: "jobs_pending",
+    JobStatus.ANALYZING.value: "jobs_analyzing",
+    JobStatus.COMPLETE.value: "jobs_complete",
+}
+COUNTER_COLUMNS = (
+    "jobs_pending", "jobs_analyzing", "jobs_complete",
+    "videos_total", "videos_pending", "reports_total", "reports_this_week",
+)
+
+_task = None
+
+
+def _status_value(status):
+    return getattr(status, "value", status)
+
+
+def week_start(now: datetime = None) -> datetime:
+    """Monday 00:00 UTC of the current week"""
+    now = now or datetime.utcnow()
+    return (now - timedelta(days=now.weekday())).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+async def _execute_best_effort(query):
+    """Counter writes never fail the request that triggered them; reconcile() corrects any drift"""
+    try:
+        await database.execute(query)
+    except Exception as e:
+        logger.error("Summary counter update failed: %s", str(e))
+
+
+def _new_row(user_id: int, **values) -> dict:
+    # The driver sends NULL for omitted columns rather than their Python defaults, so every counter is explicit
+    return {"user_id": user_id, **{name: 0 for name in COUNTER_COLUMNS}, "updated_at": datetime.utcnow(), **values}
+
+
+async def bump(user_id: int, **deltas):
+    """Apply counter deltas to a user's summary row, creating it if needed"""
+    query = insert(user_summaries).values(**_new_row(user_id, **deltas))
+    query = query.on_conflict_do_update(
+        index_elements=[user_summaries.c.user_id],
+        set_={
+            **{name: user_summaries.c[name] + delta for name, delta in deltas.items()},
+            "updated_at": query.excluded.updated_at,
+        }
+    )
+    await _execute_best_effort(query)
+
+
+async def job_created(user_id: int, status):
+    await bump(user_id, **{STATUS_COLUMNS[_status_value(status)]: 1})
+
+
+async def job_status_changed(user_id: int, old_status, new_status):
+    old_column = STATUS_COLUMNS[_status_value(old_status)]
+    new_column = STATUS_COLUMNS[_status_value(new_status)]
+    if old_column != new_column:
+        await bump(user_id, **{old_column: -1, new_column: 1})
+
+
+async def videos_added(user_id: int, count: int = 1):
+    await bump(user_id, videos_total=count, videos_pending=count)
+
+
+async def report_generated(user_id: int):
+    """Count a report, restarting the weekly counter when a new week has begun"""
+    current_week = week_start()
+    query = insert(user_summaries).values(
+        **_new_row(user_id, reports_total=1, reports_week_start=current_week, reports_this_week=1)
+    )
+    query = query.on_conflict_do_update(
+        index_elements=[user_summaries.c.user_id],
+        set_={
+            "reports_total": user_summaries.c.reports_total + 1,
+            "reports_this_week": case(
+                (user_summaries.c.reports_week_start == current_week, user_summaries.c.reports_this_week + 1),
+                else_=1
+            ),
+            "reports_week_start": current_week,
+            "updated_at": query.excluded.updated_at,
+        }
+    )
+    await _execute_best_effort(query)
+
+
+async def get_summary(user_id: int) -> dict:
+    """Counters for one user: a single primary-key lookup"""
+    row = await database.fetch_one(select(user_summaries).where(user_summaries.c.user_id == user_id))
+    if not row:
+        return {name: 0 for name in COUNTER_COLUMNS}
+
+    result = {name: row[name] for name in COUNTER_COLUMNS}
+    if row["reports_week_start"] != week_start():
+        result["reports_this_week"] = 0
+    return result
+
+
+async def reconcile():
+    """Recompute every user's counters from the source tables in one INSERT ... SELECT.
+
+    Counting and upserting in a single statement leaves no gap in which a
+    concurrent bump() could commit and then be overwritten.
+    """
+    current_week = week_start()
+
+    job_counts = (
+        select(
+            jobs.c.user_id,
+            *[func.count().filter(jobs.c.status == status).label(column) for status, column in STATUS_COLUMNS.items()],
+        )
+        .group_by(jobs.c.user_id)
+        .subquery()
+    )
+    video_counts = (
+        select(
+            videos.c.user_id,
+            func.count().label("videos_total"),
+            func.count().filter(or_(videos.c.processed == 0, videos.c.processed.is_(None))).label("videos_pending"),
+        )
+        .group_by(videos.c.user_id)
+        .subquery()
+    )
+    report_counts = (
+        select(
+            jobs.c.user_id,
+            func.count().label("reports_total"),
+            func.count().filter(reports.c.generated_at >= current_week).label("reports_this_week"),
+        )
+        .select_from(reports.join(jobs, reports.c.job_id == jobs.c.id))
+        .group_by(jobs.c.user_id)
+        .subquery()
+    )
+    # Subquery each counter comes from; the rest are job status counts
+    sources = {
+        "videos_total": video_counts,
+        "videos_pending": video_counts,
+        "reports_total": report_counts,
+        "reports_this_week": report_counts,
+    }
+
+    counts = (
+        select(
+            users.c.id,
+            *[func.coalesce(sources.get(name, job_counts).c[name], 0) for name in COUNTER_COLUMNS],
+            literal(current_week, DateTime),
+            literal(datetime.utcnow(), DateTime),
+        )
+        .select_from(
+            users
+            .outerjoin(job_counts, job_counts.c.user_id == users.c.id)
+            .outerjoin(video_counts, video_counts.c.user_id == users.c.id)
+            .outerjoin(report_counts, report_counts.c.user_id == users.c.id)
+        )
+    )
+    columns = ("user_id",) + COUNTER_COLUMNS + ("reports_week_start", "updated_at")
+    query = insert(user_summaries).from_select(columns, counts)
+    query = query.on_conflict_do_update(
+        index_elements=[user_summaries.c.user_id],
+        set_={name: query.excluded[name] for name in columns[1:]}
+    )
+    await database.execute(query)
+
+
+async def _run_reconciler():
+    while True:
+        try:
+            await reconcile()
+        except Exception as e:
+            logger.error("Summary reconcile failed: %s", str(e))
+        await asyncio.sleep(SUMMARY_RECONCILE_SECONDS)
+
+
+def start_reconciler():
+    global _task
+    if _task is None:
+        _task = asyncio.create_task(_run_reconciler())
+
+
+def stop_reconciler():
+    global _task
+    if _task is not None:
+        _task.cancel()
+        _task = None
@@ -0,0 +1,185 @@
+# synthetic.py
+from typing import NamedTuple
+
+import numpy as np
+
+# Class ids used by the generator, with (width, height) in units of frame height
+VEHICLE_CLASSES = {
+    0: ("car", (0.045, 0.045)),
+    1: ("truck", (0.07, 0.07)),
+    2: ("bus", (0.08, 0.08)),
+    3: ("motorcycle", (0.02, 0.02)),
+}
+CLASS_WEIGHTS = (0.75, 0.1, 0.05, 0.1)
+
+# Approaches in gate order: the counting lines returned by the scene use the same indices
+APPROACHES = ("north", "east", "south", "west")
+
+
+class SyntheticScene(NamedTuple):
+    width: int
+    height: int
+    fps: float
+    frame_count: int
+    lines: np.ndarray  # (4, 2, 2) counting lines, one per approach
+    gt_frames: np.ndarray  # ground-truth track points
+    gt_track_ids: np.ndarray
+    gt_boxes: np.ndarray  # (N, 4) x1, y1, x2, y2
+    gt_classes: np.ndarray
+    det_frames: np.ndarray  # noisy, occluded detections
+    detections: np.ndarray  # (M, 6) x1, y1, x2, y2, score, class_id
+    movements: np.ndarray  # (V, 3) approach, exit, class_id per vehicle
+
+
+def _geometry(width: int, height: int):
+    """Entry/exit points per approach and a counting line across each approach road"""
+    cx, cy = width / 2, height / 2
+    lane = 0.04 * height
+    margin = 0.1 * height
+    # Vehicles drive on the right: entering on one side of the road, leaving on the other
+    entries = np.array([
+        [cx - lane, -margin],
+        [width + margin, cy - lane],
+        [cx + lane, height + margin],
+        [-margin, cy + lane],
+    ])
+    exits = np.array([
+        [cx + lane, -margin],
+        [width + margin, cy + lane],
+        [cx - lane, height + margin],
+        [-margin, cy - lane],
+    ])
+    road = 0.15 * height
+    lines = np.array([
+        [[cx - road, 0.15 * height], [cx + road, 0.15 * height]],
+        [[width - 0.15 * height, cy - road], [width - 0.15 * height, cy + road]],
+        [[cx - road, 0.85 * height], [cx + road, 0.85 * height]],
+        [[0.15 * height, cy - road], [0.15 * height, cy + road]],
+    ])
+    return entries, exits, np.array([cx, cy]), lines
+
+
+def _walk(path, speed, frames):
+    """Positions after moving `speed` pixels per frame along a polyline"""
+    legs = np.diff(path, axis=0)
+    leg_lengths = np.hypot(legs[:, 0], legs[:, 1])
+    cumulative = np.concatenate([[0], np.cumsum(leg_lengths)])
+    distance = np.minimum(np.arange(frames) * speed, cumulative[-1])
+    return np.column_stack([
+        np.interp(distance, cumulative, path[:, 0]),
+        np.interp(distance, cumulative, path[:, 1]),
+    ])
+
+
+def generate_scene(
+    duration_seconds: float = 60,
+    fps: float = 25,
+    width: int = 1280,
+    height: int = 720,
+    vehicles_per_minute: float = 120,
+    speed: float = 0.006,
+    occlusion: float = 0.05,
+    position_noise: float = 1.0,
+    seed: int = 0,
+) -> SyntheticScene:
+    """Build a four-way intersection scene with ground truth and a detector-like stream.
+
+    speed is in frame heights per frame (jittered +/-30% per vehicle);
+    occlusion is the chance a detection is missing in any frame; vehicles
+    only spawn if they can finish their movement before the video ends.
+    """
+    rng = np.random.default_rng(seed)
+    frame_count = int(duration_seconds * fps)
+    entries, exits, center, lines = _geometry(width, height)
+
+    n_vehicles = rng.poisson(vehicles_per_minute * duration_seconds / 60)
+    approach = rng.integers(0, 4, n_vehicles)
+    exit_gate = (approach + rng.integers(1, 4, n_vehicles)) % 4  # no U-turns
+    classes = rng.choice(len(CLASS_WEIGHTS), size=n_vehicles, p=CLASS_WEIGHTS)
+    speeds = speed * height * rng.uniform(0.7, 1.3, n_vehicles)
+
+    frames_out, ids_out, boxes_out, classes_out, movements = [], [], [], [], []
+    for i in range(n_vehicles):
+        path = np.array([entries[approach[i]], center + rng.normal(0, 0.01 * height, 2), exits[exit_gate[i]]])
+        length = np.hypot(*np.diff(path, axis=0).T).sum()
+        lifetime = int(np.ceil(length / speeds[i])) + 1
+        if lifetime >= frame_count:
+            continue
+        start = int(rng.integers(0, frame_count - lifetime))
+
+        centers = _walk(path, speeds[i], lifetime)
+        w, h = np.array(VEHICLE_CLASSES[int(classes[i])][1]) * height
+        frames_out.append(np.arange(start, start + lifetime))
+        ids_out.append(np.full(lifetime, i + 1))
+        boxes_out.append(np.column_stack([centers - [w / 2, h / 2], centers + [w / 2, h / 2]]))
+        classes_out.append(np.full(lifetime, classes[i]))
+        movements.append((approach[i], exit_gate[i], classes[i]))
+
+    if frames_out:
+        gt_frames = np.concatenate(frames_out)
+        gt_track_ids = np.concatenate(ids_out)
+        gt_boxes = np.concatenate(boxes_out).astype(np.float32)
+        gt_classes = np.concatenate(classes_out).astype(np.int32)
+    else:
+        gt_frames = np.empty(0, dtype=np.int64)
+        gt_track_ids = np.empty(0, dtype=np.int64)
+        gt_boxes = np.empty((0, 4), dtype=np.float32)
+        gt_classes = np.empty(0, dtype=np.int32)
+
+    order = np.argsort(gt_frames, kind="stable")
+    gt_frames, gt_track_ids, gt_boxes, gt_classes = gt_frames[order], gt_track_ids[order], gt_boxes[order], gt_classes[order]
+
+    # Detector stream: drop occluded boxes, jitter the rest, keep only what is on screen
+    visible = rng.random(len(gt_frames)) >= occlusion
+    centers = (gt_boxes[:, :2] + gt_boxes[:, 2:]) / 2
+    visible &= (centers[:, 0] >= 0) & (centers[:, 0] < width) & (centers[:, 1] >= 0) & (centers[:, 1] < height)
+    noisy = gt_boxes[visible] + rng.normal(0, position_noise, (int(visible.sum()), 4)).astype(np.float32)
+    detections = np.column_stack([
+        noisy,
+        rng.uniform(0.5, 1.0, len(noisy)),
+        gt_classes[visible],
+    ]).astype(np.float32)
+
+    return SyntheticScene(
+        width=width,
+        height=height,
+        fps=fps,
+        frame_count=frame_count,
+        lines=lines,
+        gt_frames=gt_frames,
+        gt_track_ids=gt_track_ids,
+        gt_boxes=gt_boxes,
+        gt_classes=gt_classes,
+        det_frames=gt_frames[visible],
+        detections=detections,
+        movements=np.array(movements, dtype=np.int64).reshape(-1, 3),
+    )
+
+
+def write_video(scene: SyntheticScene, path: str, codec: str = "mp4v"):
+    """Render the ground truth as coloured boxes on a plain intersection background"""
+    import cv2
+
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*codec), scene.fps, (scene.width, scene.height))
+    if not writer.isOpened():
+        raise ValueError(f"Unable to open video writer for {path}")
+
+    background = np.full((scene.height, scene.width, 3), 90, dtype=np.uint8)
+    road = int(0.15 * scene.height)
+    cx, cy = scene.width // 2, scene.height // 2
+    background[:, cx - road:cx + road] = 60
+    background[cy - road:cy + road, :] = 60
+    colours = np.array([[40, 40, 220], [220, 160, 40], [40, 200, 240], [200, 60, 200]], dtype=np.uint8)
+
+    starts = np.searchsorted(scene.gt_frames, np.arange(scene.frame_count), side="left")
+    ends = np.searchsorted(scene.gt_frames, np.arange(scene.frame_count), side="right")
+    try:
+        for frame_index in range(scene.frame_count):
+            frame = background.copy()
+            boxes = scene.gt_boxes[starts[frame_index]:ends[frame_index]].astype(np.int32)
+            classes = scene.gt_classes[starts[frame_index]:ends[frame_index]]
+            for (x1, y1, x2, y2), class_id in zip(boxes, classes):
+                frame[max(y1, 0):max(y2, 0), max(x1, 0):max(x2, 0)] = colours[class_id]
+            writer.write(frame)
+    finally:
+        writer.release()
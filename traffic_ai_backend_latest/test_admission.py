@@ -0,0 +1,36 @@
+# test_admission.py
+import asyncio
+
+from admission import AdmissionLane, LaneFull
+
+
+async def _burst(lane, size, hold=0.05):
+    async def request(i):
+        try:
+            async with lane.admit(f"user:{i}"):
+                await asyncio.sleep(hold)
+            return "ok"
+        except LaneFull:
+            return "rejected"
+
+    return await asyncio.gather(*(request(i) for i in range(size)))
+
+
+def test_burst_on_idle_lane_respects_queue_bound():
+    lane = AdmissionLane("upload", max_concurrent=1, max_queue=1)
+    results = asyncio.run(_burst(lane, 4))
+    assert results.count("ok") == 2
+    assert results.count("rejected") == 2
+
+
+def test_zero_queue_admits_only_concurrent_slots():
+    lane = AdmissionLane("interactive", max_concurrent=1, max_queue=0)
+    results = asyncio.run(_burst(lane, 3))
+    assert results.count("ok") == 1
+
+
+def test_lane_is_reusable_after_burst():
+    lane = AdmissionLane("report", max_concurrent=2, max_queue=0)
+    asyncio.run(_burst(lane, 5))
+    assert lane._active == 0 and lane._waiting == 0 and not lane._per_user
+    assert asyncio.run(_burst(lane, 2)) == ["ok", "ok"]
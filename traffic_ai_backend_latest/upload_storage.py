@@ -0,0 +1,8 @@
+# upload_storage.py
+import shutil
+
+
+def save_upload(source, file_path: str):
+    """Stream an upload to disk in chunks; run in a thread so the event loop stays free"""
+    with open(file_path, "wb") as buffer:
+        shutil.copyfileobj(source, buffer, 1024 * 1024)
@@ -0,0 +1,96 @@
+# video_probe.py
+import asyncio
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from decouple import config
+from sqlalchemy import update
+
+from database import database
+from models import videos
+
+logger = logging.getLogger(__name__)
+
+# Number of processes used to probe uploads in the background
+PROBE_WORKERS = config("PROBE_WORKERS", default=2, cast=int)
+
+# Columns filled in by the probe, in the order they are returned to clients
+VIDEO_METADATA_FIELDS = ("duration_seconds", "fps", "frame_count", "width", "height", "codec")
+
+_executor = None
+_pending_tasks = set()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=PROBE_WORKERS)
+    return _executor
+
+
+def probe_video_file(file_path: str) -> dict:
+    """Read container metadata for a video file without decoding frames"""
+    import cv2
+
+    capture = cv2.VideoCapture(file_path)
+    try:
+        if not capture.isOpened():
+            raise ValueError(f"Unable to open video: {file_path}")
+
+        fps = capture.get(cv2.CAP_PROP_FPS) or 0.0
+        frame_count = int(capture.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+        width = int(capture.get(cv2.CAP_PROP_FRAME_WIDTH) or 0)
+        height = int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT) or 0)
+        fourcc = int(capture.get(cv2.CAP_PROP_FOURCC) or 0)
+    finally:
+        capture.release()
+
+    codec = "".join(chr((fourcc >> (8 * i)) & 0xFF) for i in range(4)).strip("\x00 ") or None
+
+    return {
+        "duration_seconds": frame_count / fps if fps > 0 else None,
+        "fps": fps or None,
+        "frame_count": frame_count or None,
+        "width": width or None,
+        "height": height or None,
+        "codec": codec,
+    }
+
+
+async def probe_and_store(video_id: int, file_path: str):
+    """Probe a video in the worker pool and persist the result on its row"""
+    loop = asyncio.get_running_loop()
+    try:
+        metadata = await loop.run_in_executor(_get_executor(), probe_video_file, file_path)
+    except Exception as e:
+        logger.warning("Probe failed for video %s (%s): %s", video_id, file_path, str(e))
+        return None
+
+    await database.execute(
+        update(videos).where(videos.c.id == video_id).values(
+            probed_at=datetime.utcnow(),
+            **metadata
+        )
+    )
+    return metadata
+
+
+def schedule_probe(video_id: int, file_path: str):
+    """Queue a probe without blocking the upload request"""
+    task = asyncio.create_task(probe_and_store(video_id, file_path))
+    _pending_tasks.add(task)
+    task.add_done_callback(_pending_tasks.discard)
+    return task
+
+
+def video_metadata(video) -> dict:
+    """Metadata subset of a videos row for API responses"""
+    return {field: video[field] for field in VIDEO_METADATA_FIELDS}
+
+
+def shutdown_probe_pool():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
@@ -1,9 +1,16 @@
 import os
 from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse
+from sqlalchemy import select, and_
 from sqlalchemy.dialects.postgresql import insert
 from database import database, engine
 from models import videos
 from auth import oauth2_scheme, get_current_user
+from video_probe import schedule_probe
+from upload_storage import save_upload
+import summary
+from storage_tiering import ensure_hot
 
 router = APIRouter()
 
@@ -29,8 +36,7 @@ async def upload_video(file: UploadFile = File(...), token: str = Depends(oauth2
     # Save file locally
     file_path = os.path.join(UPLOAD_DIR, file.filename)
     try:
-        with open(file_path, "wb") as buffer:
-            buffer.write(await file.read())
+        await run_in_threadpool(save_upload, file.file, file_path)
     except Exception as e:
         raise HTTPException(status_code=500, detail="Error saving file")
    
@@ -39,6 +45,31 @@ async def upload_video(file: UploadFile = File(...), token: str = Depends(oauth2
         user_id=user_id,
         filename=file.filename,
         file_path=file_path
+    ).returning(videos.c.id)
+    video_id = await database.execute(query)
+    schedule_probe(video_id, file_path)
+    await summary.videos_added(user_id)
+    return {"message": "Video uploaded successfully", "filename": file.filename}
+
+@router.get("/{video_id}/download")
+async def download_video(video_id: int, token: str = Depends(oauth2_scheme)):
+    """Download a raw video, recalling it from cold storage if it has been archived"""
+    user = await get_current_user(token)
+
+    video = await database.fetch_one(
+        select(videos).where(
+            and_(
+                videos.c.id == video_id,
+                videos.c.user_id == user["id"]
+            )
+        )
     )
-    await database.execute(query)
-    return {"message": "Video uploaded successfully", "filename": file.filename}
\ No newline at end of file
+    if not video:
+        raise HTTPException(status_code=404, detail="Video not found")
+
+    try:
+        file_path = await ensure_hot(video_id)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Video file not found")
+
+    return FileResponse(path=file_path, filename=video["filename"])
\ No newline at end of file
@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 from sqlalchemy import select
-from database import database
+from database import read_database
 from models import videos  # ✅ Import videos table from models.py
 
 router = APIRouter()
@@ -8,5 +8,5 @@ router = APIRouter()
 @router.get("/list/")
 async def get_videos():
     query = select(videos)
-    results = await database.fetch_all(query)
+    results = await read_database.fetch_all(query)
     return [{"id": row.id, "filename": row.filename} for row in results]
\ No newline at end of file